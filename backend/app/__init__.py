@@ -1,18 +1,37 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
+from .data import BOOKINGS, NOTIFICATIONS
+from .middleware import BodySizeLimitMiddleware
 from .routes import router
-from .storage import initialize_storage
+from .storage import (
+    initialize_storage, compact_bookings, compact_notifications,
+    run_periodic_compaction, run_write_behind,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifespan - load data on startup"""
+    """Manage application lifespan - load data on startup, flush and compact on shutdown"""
     initialize_storage()
+    compaction = asyncio.create_task(run_periodic_compaction())
+    write_behind = asyncio.create_task(run_write_behind())
     yield
+    compaction.cancel()
+    write_behind.cancel()
+    # Let the flusher write out anything still queued before exiting
+    await asyncio.gather(write_behind, return_exceptions=True)
+    compact_bookings(BOOKINGS)
+    compact_notifications(NOTIFICATIONS)
 
 
 app = FastAPI(title="Room Booking API", version="1.0.0", lifespan=lifespan)
+# Compress larger JSON lists (rooms, bookings, notifications) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+# Outermost: refuse oversized request bodies before anything reads them
+app.add_middleware(BodySizeLimitMiddleware)
 app.include_router(router)
 
 __all__ = ["app"]
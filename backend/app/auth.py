@@ -2,18 +2,22 @@
 Authentication utilities for JWT token generation and verification
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Annotated, Optional
 
 import bcrypt
 from jose import jwt
 from jose.exceptions import JWTError
-from pydantic import BaseModel, field_validator
+from pydantic import AfterValidator, BaseModel, StringConstraints
 
 from fastapi import Header, HTTPException
 
+# Bcrypt work factor for new hashes (bcrypt's default). Only the test suite
+# lowers it; existing hashes carry their own cost, so verification is unaffected.
+BCRYPT_ROUNDS = 12
+
 # Hash password
 def hash_password(password):
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     # Bcrypt has a 72-byte limit, truncate if necessary for safety
     password_bytes = password.encode('utf-8')[:72]
     hashed = bcrypt.hashpw(password_bytes, salt) 
@@ -47,44 +51,35 @@ class LoginResponse(BaseModel):
     token: str
     user: dict
 
+# Length limits, stripping and lowercasing run inside pydantic-core
+RegisterName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+RegisterPassword = Annotated[str, StringConstraints(min_length=6, max_length=50)]
+
+
+def _require_email_shape(v: str) -> str:
+    if '@' not in v or '.' not in v:
+        raise ValueError("Invalid email format")
+    return v
+
+
+RegisterEmail = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, to_lower=True, max_length=50),
+    AfterValidator(_require_email_shape),
+]
+
+
 class RegisterRequest(BaseModel):
-    name: str
-    email: str
-    password: str
+    name: RegisterName
+    email: RegisterEmail
+    password: RegisterPassword
     role: str = "attendee"
 
-    @field_validator('name')
-    @classmethod
-    def validate_name(cls, v):
-        if len(v) > 100:
-            raise ValueError("Name must be less than 100 characters")
-        if len(v.strip()) == 0:
-            raise ValueError("Name cannot be empty")
-        return v.strip()
-    
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v):
-        if len(v) < 6:
-            raise ValueError("Password must be at least 6 characters")
-        if len(v) > 50:
-            raise ValueError("Password must be less than 50 characters")
-        return v
-    
-    @field_validator('email')
-    @classmethod
-    def validate_email(cls, v):
-        if len(v) > 50:
-            raise ValueError("Email must be less than 50 characters")
-        if '@' not in v or '.' not in v:
-            raise ValueError("Invalid email format")
-        return v.lower().strip()
-
 
 
 def get_current_user(authorization: str = Header(None)):
 
-    from .data import USERS
+    from .data import USERS_BY_EMAIL
     
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
@@ -99,9 +94,9 @@ def get_current_user(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     # Match token to a real user
-    for user in USERS:
-        if user.id == token_data.user_id and user.email == token_data.email:
-            return user
+    user = USERS_BY_EMAIL.get(token_data.email)
+    if user is not None and user.id == token_data.user_id:
+        return user
 
     raise HTTPException(status_code=401, detail="User not found")
 
@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from threading import Lock
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
-from .auth import hash_password
+from pydantic import BaseModel, Field, StringConstraints
 
 
 class User(BaseModel):
@@ -48,54 +48,26 @@ class Notification(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     is_read: bool = False
 
+# Optional free-text reason given when cancelling or declining
+Reason = Optional[Annotated[str, StringConstraints(max_length=500)]]
+
+
 class CreateBookingRequest(BaseModel):
     room_id: int
-    title: str
+    title: Annotated[str, StringConstraints(strip_whitespace=True, max_length=200)]
     date: str
     start_time: str
     end_time: str
-    notes: Optional[str] = None
-    attendee_emails: List[str] = []
-
-    @field_validator('title')
-    def validate_title(cls, v):
-        if len(v) > 200:
-            raise ValueError("Title must be less than 200 characters")
-        return v.strip()
-    
-    @field_validator('notes')
-    def validate_notes(cls, v):
-        if v and len(v) > 1000:
-            raise ValueError("Notes must be less than 1000 characters")
-        return v
-    
-    @field_validator('attendee_emails')
-    def validate_attendee_count(cls, v):
-        if len(v) > 50:
-            raise ValueError("Maximum 50 attendees allowed")
-        return v
+    notes: Optional[Annotated[str, StringConstraints(max_length=1000)]] = None
+    attendee_emails: Annotated[List[str], Field(max_length=50)] = []
 
 class CancelBookingRequest(BaseModel):
     """Request model for cancelling a booking with optional reason"""
-    reason: Optional[str] = None
-
-    @field_validator('reason')
-    @classmethod
-    def validate_reason(cls, v):
-        if v and len(v) > 500:
-            raise ValueError("Reason must be less than 500 characters")
-        return v
+    reason: Reason = None
 
 class DeclineInvitationRequest(BaseModel):
     """Request model for declining an invitation with optional reason"""
-    reason: Optional[str] = None
-
-    @field_validator('reason')
-    @classmethod
-    def validate_reason(cls, v):
-        if v and len(v) > 500:
-            raise ValueError("Reason must be less than 500 characters")
-        return v
+    reason: Reason = None
 
 class PublicUser(BaseModel):
     id: int
@@ -128,15 +100,33 @@ class NotificationResponse(BaseModel):
     created_at: str
     is_read: bool
 
+# Password hashes are precomputed bcrypt (cost 12) so importing this module
+# doesn't pay for three hashes; scripts/build_defaults.py copies them into
+# the shipped defaults. Passwords: password123, password012!, password2025
 USERS: List[User] = [
     # Organiser with privileges to create/manage bookings
-    User(id=1, name="Alice Johnson", email="alicejohnson@st-andrews.ac.uk", password_hash=hash_password("password123"), role="organiser"),
+    User(id=1, name="Alice Johnson", email="alicejohnson@st-andrews.ac.uk",
+         password_hash="$2b$12$7YqsGQ8VpGlClNUg.AQIcu9yu1kEyLQsqSR58erZxNEmRVuqMqFh6", role="organiser"),
     # Default attendee (cannot create bookings)
-    User(id=2, name="Ben Lee", email="benlee@st-andrews.ac.uk", password_hash=hash_password("password012!"), role="attendee"),
+    User(id=2, name="Ben Lee", email="benlee@st-andrews.ac.uk",
+         password_hash="$2b$12$kXFJhmxk7t5LLNnOjg0V/eF35aAjnfH1Tw6ymZjlZZB7YymSK/iwu", role="attendee"),
     # Second organiser
-    User(id=3, name="Chloe Smith", email="chloesmith@st-andrews.ac.uk", password_hash=hash_password("password2025"), role="organiser"),
+    User(id=3, name="Chloe Smith", email="chloesmith@st-andrews.ac.uk",
+         password_hash="$2b$12$XMfAIhtx2Zp4qfcbUbWaaOn6rfN2wYj4UV/Z94y20euGIONCVKuIK", role="organiser"),
 ]
 
+# Users keyed by (normalised) email, kept in step with USERS
+USERS_BY_EMAIL: dict[str, User] = {}
+
+
+def rebuild_user_index() -> None:
+    """Recompute USERS_BY_EMAIL from USERS."""
+    USERS_BY_EMAIL.clear()
+    USERS_BY_EMAIL.update((user.email, user) for user in USERS)
+
+
+rebuild_user_index()
+
 ROOMS: List[Room] = [
     # Small rooms (1-8 people)
     Room(id=1, name="Study Room 101", capacity=4, facilities=["whiteboard"], building="Library"),
@@ -184,5 +174,55 @@ BOOKINGS: List[Booking] = [
     ),
 ]
 
+# Bookings keyed by id, kept in step with BOOKINGS
+BOOKINGS_BY_ID: dict[int, Booking] = {}
+
+
+def rebuild_booking_index() -> None:
+    """Recompute BOOKINGS_BY_ID from BOOKINGS."""
+    BOOKINGS_BY_ID.clear()
+    BOOKINGS_BY_ID.update((booking.id, booking) for booking in BOOKINGS)
+
+
+rebuild_booking_index()
+
 # Store notifications
 NOTIFICATIONS: List[Notification] = []
+
+# Per-user notification indexes, kept in step with NOTIFICATIONS:
+# each user's notifications ordered oldest -> newest, and their unread count
+NOTIFICATIONS_BY_USER: dict[int, List[Notification]] = {}
+UNREAD_COUNT_BY_USER: dict[int, int] = {}
+
+
+def rebuild_notification_indexes() -> None:
+    """Recompute the per-user notification indexes from NOTIFICATIONS."""
+    NOTIFICATIONS_BY_USER.clear()
+    UNREAD_COUNT_BY_USER.clear()
+    for notification in sorted(NOTIFICATIONS, key=lambda n: n.created_at):
+        NOTIFICATIONS_BY_USER.setdefault(notification.user_id, []).append(notification)
+        if not notification.is_read:
+            UNREAD_COUNT_BY_USER[notification.user_id] = UNREAD_COUNT_BY_USER.get(notification.user_id, 0) + 1
+
+# Monotonic id counters (last id issued per collection). Seeded from the data
+# above and re-seeded by initialize_storage() once persisted data is loaded.
+_ID_LOCK = Lock()
+_LAST_IDS: dict[str, int] = {}
+
+
+def reset_id_counters() -> None:
+    """Seed the id counters from the current contents of each collection."""
+    with _ID_LOCK:
+        _LAST_IDS["user"] = max((u.id for u in USERS), default=0)
+        _LAST_IDS["booking"] = max((b.id for b in BOOKINGS), default=0)
+        _LAST_IDS["notification"] = max((n.id for n in NOTIFICATIONS), default=0)
+
+
+def next_id(kind: str) -> int:
+    """Return the next id for a collection ("user", "booking" or "notification")."""
+    with _ID_LOCK:
+        _LAST_IDS[kind] += 1
+        return _LAST_IDS[kind]
+
+
+reset_id_counters()
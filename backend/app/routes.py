@@ -1,14 +1,26 @@
+from bisect import insort
+from operator import attrgetter
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, Query
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.routing import APIRoute
+from datetime import date, datetime, time, timedelta
 
-from .storage import save_users, save_bookings, save_notifications
+import orjson
+
+from .storage import (
+    save_users, journal_booking, journal_booking_deleted,
+    journal_notification, journal_notification_deleted,
+)
 
 from .data import (
     BOOKINGS,
+    BOOKINGS_BY_ID,
     ROOMS,
     USERS,
+    USERS_BY_EMAIL,
     NOTIFICATIONS,
+    NOTIFICATIONS_BY_USER,
+    UNREAD_COUNT_BY_USER,
     Booking,
     Room,
     PublicUser,
@@ -19,6 +31,7 @@ from .data import (
     BookingResponse,
     Notification,
     NotificationResponse,
+    next_id,
 )
 from .auth import (
     get_current_user, 
@@ -39,15 +52,37 @@ from .validation import (
     sanitize_string
 )
 
-router = APIRouter()
+class ORJSONRequest(Request):
+    """Request whose JSON body is parsed with orjson instead of the stdlib json module"""
+
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+            # malformed bodies still produce FastAPI's usual 422 response
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route that hands endpoints an ORJSONRequest"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+router = APIRouter(route_class=ORJSONRoute)
 ORGANISER_ROLES = {"organiser"}
 
 
 def create_notification(user_id: int, notif_type: str, title: str, message: str, booking_id: int = None):
     """Helper function to create and save a notification"""
-    new_id = max((n.id for n in NOTIFICATIONS), default=0) + 1
     notification = Notification(
-        id=new_id,
+        id=next_id("notification"),
         user_id=user_id,
         type=notif_type,
         title=title,
@@ -57,7 +92,9 @@ def create_notification(user_id: int, notif_type: str, title: str, message: str,
         is_read=False
     )
     NOTIFICATIONS.append(notification)
-    save_notifications(NOTIFICATIONS)
+    insort(NOTIFICATIONS_BY_USER.setdefault(user_id, []), notification, key=attrgetter("created_at"))
+    UNREAD_COUNT_BY_USER[user_id] = UNREAD_COUNT_BY_USER.get(user_id, 0) + 1
+    journal_notification(notification)
     return notification
 
 
@@ -82,32 +119,31 @@ def process_booking_reminders():
         if booking.reminder_sent or booking.start_time != target_time:
             continue
         
-        # Get room name and calculate time
+        # Get room name and build the message once per booking
         room = next((r for r in ROOMS if r.id == booking.room_id), None)
         room_name = room.name if room else "Unknown Room"
-        time_until = booking.start_time - now
-        minutes = int(time_until.total_seconds() / 60)
         time_str = booking.start_time.strftime('%H:%M')
+        details = f" '{booking.title}' in {room_name} starts at {time_str} (in 1 hour)."
+        organiser_message = "Your meeting" + details
+        attendee_message = "Meeting" + details
         
         # Create reminders for all recipients (organizer + attendees)
         recipients = [booking.organiser_id] + booking.attendee_ids
         
         for user_id in recipients:
             is_organizer = user_id == booking.organiser_id
-            message_prefix = "Your meeting" if is_organizer else "Meeting"
             
             create_notification(
                 user_id=user_id,
                 notif_type="booking_reminder",
                 title="Upcoming Meeting Reminder",
-                message=f"{message_prefix} '{booking.title}' in {room_name} starts at {time_str} (in 1 hour).",
+                message=organiser_message if is_organizer else attendee_message,
                 booking_id=booking.id
             )
         
         # Mark reminder as sent
         booking.reminder_sent = True
-    
-    save_bookings(BOOKINGS)
+        journal_booking(booking)
 
 
 def booking_to_response(booking: Booking, current_user: User) -> BookingResponse:
@@ -156,6 +192,19 @@ def booking_to_response(booking: Booking, current_user: User) -> BookingResponse
     )
 
 
+def notification_to_response(notification: Notification) -> NotificationResponse:
+    """Transform a Notification object to NotificationResponse format for frontend."""
+    return NotificationResponse(
+        id=notification.id,
+        type=notification.type,
+        title=notification.title,
+        message=notification.message,
+        booking_id=notification.booking_id,
+        created_at=notification.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        is_read=notification.is_read
+    )
+
+
 @router.get("/health")
 def health_check() -> dict[str, str]:
     """Simple heartbeat endpoint for uptime monitoring."""
@@ -180,13 +229,12 @@ def register(data: RegisterRequest) -> LoginResponse:
     clean_role = validate_role(data.role)
     
     # Check if email already exists
-    if any(u.email == clean_email for u in USERS):
+    if clean_email in USERS_BY_EMAIL:
         raise HTTPException(status_code=409, detail="Email already registered")
     
     # Create new user with hashed password
-    next_id = max([user.id for user in USERS] + [0]) + 1
     new_user = User(
-        id=next_id,
+        id=next_id("user"),
         name=clean_name,
         email=clean_email,
         password_hash=hash_password(data.password),
@@ -195,6 +243,7 @@ def register(data: RegisterRequest) -> LoginResponse:
         locked_until=None
     )
     USERS.append(new_user)
+    USERS_BY_EMAIL[new_user.email] = new_user
     save_users(USERS)
     
     # Create JWT token
@@ -215,7 +264,7 @@ def register(data: RegisterRequest) -> LoginResponse:
 def login(credentials: LoginRequest) -> LoginResponse:
     """Authenticate user and return JWT token"""
     # Find user by email
-    user = next((u for u in USERS if u.email == credentials.email), None)
+    user = USERS_BY_EMAIL.get(credentials.email)
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -290,11 +339,9 @@ def get_available_rooms(
     """
     # Parse the date and time
     try:
-        booking_date = datetime.strptime(date, "%Y-%m-%d").date()
-        start_dt = datetime.strptime(start_time, "%H:%M").time()
-        end_dt = datetime.strptime(end_time, "%H:%M").time()
-        start = datetime.combine(booking_date, start_dt)
-        end = datetime.combine(booking_date, end_dt)
+        booking_date = _parse_date(date)
+        start = datetime.combine(booking_date, _parse_time(start_time))
+        end = datetime.combine(booking_date, _parse_time(end_time))
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date or time format")
     
@@ -391,12 +438,12 @@ def get_user_profile(current_user: User = Depends(get_current_user)) -> dict:
     }
 
 
-def _booking_index(booking_id: int) -> int:
-    """Return index of booking or raise 404."""
-    for idx, booking in enumerate(BOOKINGS):
-        if booking.id == booking_id:
-            return idx
-    raise HTTPException(status_code=404, detail="Booking not found")
+def _get_booking_or_404(booking_id: int) -> Booking:
+    """Return the booking with this id or raise 404."""
+    booking = BOOKINGS_BY_ID.get(booking_id)
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return booking
 
 
 def overlaps(a_start, a_end, b_start, b_end) -> bool:
@@ -404,16 +451,38 @@ def overlaps(a_start, a_end, b_start, b_end) -> bool:
     return a_start < b_end and b_start < a_end
 
 
+def _parse_date(value: str) -> date:
+    """
+    Parse a YYYY-MM-DD string without going through strptime.
+    Accepts the same 1-2 digit month/day forms strptime does; raises ValueError otherwise.
+    """
+    year, month, day = value.split("-")
+    if (not value.isascii() or len(year) != 4 or not 1 <= len(month) <= 2
+            or not 1 <= len(day) <= 2 or not (year + month + day).isdigit()):
+        raise ValueError(f"Invalid date: {value!r}")
+    return date(int(year), int(month), int(day))
+
+
+def _parse_time(value: str) -> time:
+    """
+    Parse an HH:MM string without going through strptime.
+    Accepts the same 1-2 digit hour/minute forms strptime does; raises ValueError otherwise.
+    """
+    hour, minute = value.split(":")
+    if (not value.isascii() or not 1 <= len(hour) <= 2 or not 1 <= len(minute) <= 2
+            or not (hour + minute).isdigit()):
+        raise ValueError(f"Invalid time: {value!r}")
+    return time(int(hour), int(minute))
+
+
 def _parse_request_times(date_str: str, start_str: str, end_str: str) -> tuple[datetime, datetime]:
     """
     Parse date/time strings into datetimes with basic validation shared by create/update.
     """
     try:
-        booking_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        start_date = datetime.strptime(start_str, "%H:%M").time()
-        end_date = datetime.strptime(end_str, "%H:%M").time()
-        start = datetime.combine(booking_date, start_date)
-        end = datetime.combine(booking_date, end_date)
+        booking_date = _parse_date(date_str)
+        start = datetime.combine(booking_date, _parse_time(start_str))
+        end = datetime.combine(booking_date, _parse_time(end_str))
     except ValueError:
         raise HTTPException(
             status_code=400,
@@ -430,15 +499,10 @@ def _parse_request_times(date_str: str, start_str: str, end_str: str) -> tuple[d
 
 
 def _resolve_attendees(attendee_emails: list[str]) -> list[int]:
-    """Convert attendee emails to user IDs or raise if any are invalid."""
-    attendee_ids: list[int] = []
-    invalid_emails: list[str] = []
-    for email in attendee_emails:
-        user = next((u for u in USERS if u.email == email), None)
-        if user:
-            attendee_ids.append(user.id)
-        else:
-            invalid_emails.append(email)
+    """Convert attendee emails to user IDs (duplicates dropped) or raise if any are invalid."""
+    unique_emails = list(dict.fromkeys(attendee_emails))
+    found = {email: USERS_BY_EMAIL.get(email) for email in unique_emails}
+    invalid_emails = [email for email, user in found.items() if user is None]
 
     if invalid_emails:
         raise HTTPException(
@@ -446,7 +510,7 @@ def _resolve_attendees(attendee_emails: list[str]) -> list[int]:
             detail=f"Invalid attendee emails: {', '.join(invalid_emails)}",
         )
 
-    return attendee_ids
+    return [found[email].id for email in unique_emails]
 
 
 def _get_room_or_404(room_id: int) -> Room:
@@ -502,12 +566,9 @@ def create_booking(req: CreateBookingRequest, current_user: User = Depends(get_c
     _validate_capacity(room, accepted_count=0, pending_count=len(attendee_ids))
     _ensure_room_available(req.room_id, start, end)
 
-    # Create new booking ID
-    new_id = max((b.id for b in BOOKINGS), default=0) + 1
-
     # Create final Booking object
     new_booking = Booking(
-        id=new_id,
+        id=next_id("booking"),
         room_id=req.room_id,
         organiser_id=current_user.id,
         attendee_ids=[], 
@@ -521,7 +582,8 @@ def create_booking(req: CreateBookingRequest, current_user: User = Depends(get_c
     )
 
     BOOKINGS.append(new_booking)
-    save_bookings(BOOKINGS)
+    BOOKINGS_BY_ID[new_booking.id] = new_booking
+    journal_booking(new_booking)
     
     return booking_to_response(new_booking, current_user)
 
@@ -534,8 +596,7 @@ def update_booking(booking_id: int, req: CreateBookingRequest, current_user: Use
     Authorization: Only the booking organizer can update.
     """
     _require_organiser(current_user)
-    idx = _booking_index(booking_id)
-    booking = BOOKINGS[idx]
+    booking = _get_booking_or_404(booking_id)
     
     # Authorization check: Only organizer can update
     if booking.organiser_id != current_user.id:
@@ -550,39 +611,40 @@ def update_booking(booking_id: int, req: CreateBookingRequest, current_user: Use
     start, end = _parse_request_times(req.date, req.start_time, req.end_time)
     new_attendee_ids = _resolve_attendees(req.attendee_emails)
     
-    # Separate existing accepted attendees from new invitations
+    # Keep existing accepted attendees that are still requested
+    requested = set(new_attendee_ids)
     current_accepted = set(booking.attendee_ids)
-    all_requested = set(new_attendee_ids)
-    
-    # Keep existing accepted attendees
-    accepted_attendees = list(current_accepted & all_requested)
-    
-    # New attendees go to pending (those not currently accepted)
-    new_pending = list(all_requested - current_accepted)
-    
-    # Combine with existing pending (remove duplicates)
-    current_pending = set(booking.pending_attendee_ids)
-    all_pending = list((current_pending | set(new_pending)) - current_accepted)
-
-    room = _get_room_or_404(req.room_id)
-    _validate_capacity(room, accepted_count=len(accepted_attendees), pending_count=len(all_pending))
-    _ensure_room_available(req.room_id, start, end, exclude_booking_id=booking.id)
-
-    # Update booking
-    updated_booking = booking.model_copy(update={
-        "room_id": req.room_id,
-        "attendee_ids": accepted_attendees, 
-        "pending_attendee_ids": all_pending,
-        "title": clean_title,
-        "notes": clean_notes,
-        "start_time": start,
-        "end_time": end,
-    })
+    accepted_attendees = [a for a in booking.attendee_ids if a in requested]
+    
+    # Existing pending invitations stay; other new attendees join them
+    all_pending = [a for a in booking.pending_attendee_ids if a not in current_accepted]
+    already_pending = set(all_pending)
+    all_pending += [
+        a for a in dict.fromkeys(new_attendee_ids)
+        if a not in current_accepted and a not in already_pending
+    ]
 
-    BOOKINGS[idx] = updated_booking
-    save_bookings(BOOKINGS)
+    # Only re-check the room when the slot or the head count actually changed
+    slot_changed = (req.room_id, start, end) != (booking.room_id, booking.start_time, booking.end_time)
+    people_changed = (len(accepted_attendees), len(all_pending)) != (len(booking.attendee_ids), len(booking.pending_attendee_ids))
+    if slot_changed or people_changed:
+        room = _get_room_or_404(req.room_id)
+        _validate_capacity(room, accepted_count=len(accepted_attendees), pending_count=len(all_pending))
+    if slot_changed:
+        _ensure_room_available(req.room_id, start, end, exclude_booking_id=booking.id)
+
+    # Update booking in place - every value above is already validated
+    booking.room_id = req.room_id
+    booking.attendee_ids = accepted_attendees
+    booking.pending_attendee_ids = all_pending
+    booking.title = clean_title
+    booking.notes = clean_notes
+    booking.start_time = start
+    booking.end_time = end
+
+    journal_booking(booking)
     
-    return booking_to_response(updated_booking, current_user)
+    return booking_to_response(booking, current_user)
 
 
 @router.delete("/bookings/{booking_id}", status_code=204)
@@ -598,8 +660,7 @@ def delete_booking(
     Authorization: Only the booking organizer can delete.
     """
     _require_organiser(current_user)
-    idx = _booking_index(booking_id)
-    booking = BOOKINGS[idx]
+    booking = _get_booking_or_404(booking_id)
     
     # Authorization check: Only organizer can delete
     if booking.organiser_id != current_user.id:
@@ -616,13 +677,18 @@ def delete_booking(
     reason = body.reason if body and body.reason else None
     reason_text = f"\n\nReason: {reason}" if reason else ""
     
+    # Messages are the same for every recipient, so build them once
+    details = f"'{booking.title}' scheduled for {booking.start_time.strftime('%Y-%m-%d at %H:%M')} in {room_name}"
+    accepted_message = f"The meeting {details} has been cancelled by the organizer.{reason_text}"
+    pending_message = f"Your invitation to {details} has been cancelled.{reason_text}"
+    
     # Notify all accepted attendees about cancellation
     for attendee_id in booking.attendee_ids:
         create_notification(
             user_id=attendee_id,
             notif_type="booking_cancelled",
             title="Meeting Cancelled",
-            message=f"The meeting '{booking.title}' scheduled for {booking.start_time.strftime('%Y-%m-%d at %H:%M')} in {room_name} has been cancelled by the organizer.{reason_text}",
+            message=accepted_message,
             booking_id=booking.id
         )
     
@@ -632,12 +698,13 @@ def delete_booking(
             user_id=attendee_id,
             notif_type="booking_cancelled",
             title="Meeting Invitation Cancelled",
-            message=f"Your invitation to '{booking.title}' scheduled for {booking.start_time.strftime('%Y-%m-%d at %H:%M')} in {room_name} has been cancelled.{reason_text}",
+            message=pending_message,
             booking_id=booking.id
         )
 
-    del BOOKINGS[idx]
-    save_bookings(BOOKINGS)
+    BOOKINGS.remove(booking)
+    del BOOKINGS_BY_ID[booking_id]
+    journal_booking_deleted(booking_id)
 
 
 @router.get("/bookings/{booking_id}", response_model=BookingResponse)
@@ -646,8 +713,7 @@ def get_booking_details(booking_id: int, current_user: User = Depends(get_curren
     Get details of a specific booking.
     Allows users to view booking information before accepting/declining.
     """
-    idx = _booking_index(booking_id)
-    booking = BOOKINGS[idx]
+    booking = _get_booking_or_404(booking_id)
 
     
     return booking_to_response(booking, current_user)
@@ -658,8 +724,7 @@ def accept_invitation(booking_id: int, current_user: User = Depends(get_current_
     """
     Accept an invitation to a booking.
     """
-    idx = _booking_index(booking_id)
-    booking = BOOKINGS[idx]
+    booking = _get_booking_or_404(booking_id)
     
     # Validation: Must be in pending invitations
     if current_user.id not in booking.pending_attendee_ids:
@@ -694,7 +759,7 @@ def accept_invitation(booking_id: int, current_user: User = Depends(get_current_
     # All validations passed - move from pending to accepted
     booking.pending_attendee_ids.remove(current_user.id)
     booking.attendee_ids.append(current_user.id)
-    save_bookings(BOOKINGS)
+    journal_booking(booking)
     
     return {
         "message": "Successfully accepted invitation",
@@ -709,8 +774,7 @@ def register_for_booking(booking_id: int, current_user: User = Depends(get_curre
     """
     Self-register for a booking the user is not invited to.
     """
-    idx = _booking_index(booking_id)
-    booking = BOOKINGS[idx]
+    booking = _get_booking_or_404(booking_id)
 
     if booking.organiser_id == current_user.id:
         raise HTTPException(status_code=400, detail="Organisers are already part of their bookings")
@@ -728,7 +792,7 @@ def register_for_booking(booking_id: int, current_user: User = Depends(get_curre
             raise HTTPException(status_code=400, detail="Booking is at full capacity")
 
     booking.attendee_ids.append(current_user.id)
-    save_bookings(BOOKINGS)
+    journal_booking(booking)
 
     # Notify organiser about new attendee
     create_notification(
@@ -753,7 +817,7 @@ def decline_invitation(booking_id: int, current_user: User = Depends(get_current
     """
     Decline an invitation or cancel attendance.
     """
-    booking = BOOKINGS[_booking_index(booking_id)]
+    booking = _get_booking_or_404(booking_id)
     
     # Determine user's current status
     is_pending = current_user.id in booking.pending_attendee_ids
@@ -784,7 +848,7 @@ def decline_invitation(booking_id: int, current_user: User = Depends(get_current
     # Remove user from appropriate list
     target_list = booking.pending_attendee_ids if is_pending else booking.attendee_ids
     target_list.remove(current_user.id)
-    save_bookings(BOOKINGS)
+    journal_booking(booking)
     
     return {
         "message": "Declined invitation" if is_pending else "Cancelled attendance",
@@ -802,26 +866,10 @@ def get_notifications(current_user: User = Depends(get_current_user)) -> List[No
     # Process reminders before returning notifications
     process_booking_reminders()
     
-    # Get user's notifications (sorted by most recent first)
-    user_notifications = [
-        n for n in NOTIFICATIONS 
-        if n.user_id == current_user.id
-    ]
-    user_notifications.sort(key=lambda n: n.created_at, reverse=True)
-    
-    # Transform to response format
-    return [
-        NotificationResponse(
-            id=n.id,
-            type=n.type,
-            title=n.title,
-            message=n.message,
-            booking_id=n.booking_id,
-            created_at=n.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            is_read=n.is_read
-        )
-        for n in user_notifications
-    ]
+    # User's notifications are kept oldest-first; return most recent first
+    user_notifications = NOTIFICATIONS_BY_USER.get(current_user.id, [])[::-1]
+    
+    return [notification_to_response(n) for n in user_notifications]
 
 
 @router.get("/notifications/unread/count")
@@ -830,11 +878,7 @@ def get_unread_count(current_user: User = Depends(get_current_user)) -> dict:
     # Process reminders first
     process_booking_reminders()
     
-    unread_count = sum(
-        1 for n in NOTIFICATIONS 
-        if n.user_id == current_user.id and not n.is_read
-    )
-    return {"count": unread_count}
+    return {"count": UNREAD_COUNT_BY_USER.get(current_user.id, 0)}
 
 
 @router.put("/notifications/{notification_id}/read", status_code=200)
@@ -851,8 +895,10 @@ def mark_notification_read(notification_id: int, current_user: User = Depends(ge
         raise HTTPException(status_code=403, detail="You can only mark your own notifications as read")
     
     # Mark as read
-    notification.is_read = True
-    save_notifications(NOTIFICATIONS)
+    if not notification.is_read:
+        notification.is_read = True
+        UNREAD_COUNT_BY_USER[notification.user_id] -= 1
+        journal_notification(notification)
     
     return {"message": "Notification marked as read"}
 
@@ -863,9 +909,11 @@ def delete_notification(notification_id: int, current_user: User = Depends(get_c
     # Find notification
     for idx, notification in enumerate(NOTIFICATIONS):
         if notification.id == notification_id:
-            
+            if not notification.is_read:
+                UNREAD_COUNT_BY_USER[notification.user_id] -= 1
+            NOTIFICATIONS_BY_USER[notification.user_id].remove(notification)
             del NOTIFICATIONS[idx]
-            save_notifications(NOTIFICATIONS)
+            journal_notification_deleted(notification_id)
             return
     
     raise HTTPException(status_code=404, detail="Notification not found")
@@ -2,9 +2,19 @@
 Simple JSON file storage for users, rooms, bookings, and notifications
 Refactored to use generic save/load functions - 60% less code!
 """
-import json
-from datetime import datetime
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import cache, lru_cache
 from pathlib import Path
+from types import SimpleNamespace
+
+import ijson
+import orjson
+from pydantic import TypeAdapter
 
 # Storage directory
 STORAGE_DIR = Path(__file__).parent / "data"
@@ -12,6 +22,46 @@ USERS_FILE = STORAGE_DIR / "users.json"
 ROOMS_FILE = STORAGE_DIR / "rooms.json"
 BOOKINGS_FILE = STORAGE_DIR / "bookings.json"
 NOTIFICATIONS_FILE = STORAGE_DIR / "notifications.json"
+BOOKINGS_JOURNAL = STORAGE_DIR / "bookings.jsonl"
+NOTIFICATIONS_JOURNAL = STORAGE_DIR / "notifications.jsonl"
+# Pre-built seed snapshots, regenerated by scripts/build_defaults.py
+DEFAULTS_DIR = STORAGE_DIR / "defaults"
+
+# How often the journals are folded back into their JSON snapshots
+COMPACTION_INTERVAL_MINUTES = 5
+# Journal length that triggers an early compaction
+COMPACTION_APPEND_THRESHOLD = 1000
+# How often the compaction task checks for journals past the threshold
+COMPACTION_CHECK_SECONDS = 1
+
+# Snapshots larger than this are stream-parsed with ijson, one record at a time
+STREAM_LOAD_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+# How often queued snapshot writes are flushed to disk
+FLUSH_INTERVAL_SECONDS = 0.25
+
+# Serializes journal appends against snapshot + truncate
+_journal_lock = threading.Lock()
+# Lines appended to each journal since its last compaction
+_journal_appends = {}
+
+# Latest unsaved snapshot per file, written by the background flusher
+_pending_saves = {}
+_pending_lock = threading.Lock()
+_write_behind_active = False
+
+# Set when a journal passes COMPACTION_APPEND_THRESHOLD; the compaction task
+# does the work so no request waits on a full snapshot write
+_bookings_compaction_due = threading.Event()
+_notifications_compaction_due = threading.Event()
+_compaction_active = False
+
+
+@cache
+def _models():
+    """Model classes from .data, imported once on first use"""
+    from .data import User, Room, Booking, Notification
+    return SimpleNamespace(User=User, Room=Room, Booking=Booking, Notification=Notification)
 
 
 def ensure_storage_dir():
@@ -19,39 +69,104 @@ def ensure_storage_dir():
     STORAGE_DIR.mkdir(exist_ok=True)
 
 
-def save_to_json(items, filepath, datetime_fields=None):
+@lru_cache(maxsize=None)
+def _list_adapter(model_class):
+    """Compiled pydantic-core schema for a list of model_class, built once"""
+    return TypeAdapter(list[model_class])
+
+
+def _fsync_dir(dirpath):
+    """Flush a directory entry (e.g. a rename) to disk; a no-op where unsupported"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows: directories can't be opened for fsync
+    fd = os.open(dirpath, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_to_json(items, filepath, *, pretty=False, sync_dir=True):
     """
     Generic save function for any Pydantic model list.
+    Serialized in one pass by pydantic-core without per-item model_dump().
     
     Args:
         items: List of Pydantic model instances
         filepath: Path object for the JSON file
-        datetime_fields: List of field names that contain datetime objects
+        pretty: Indent the output for reading by hand (debugging only)
+        sync_dir: fsync the directory after the rename; batch writers pass
+            False and sync it once for all their files
     """
     ensure_storage_dir()
-    datetime_fields = datetime_fields or []
+    if items:
+        data = _list_adapter(type(items[0])).dump_json(items, indent=2 if pretty else None)
+    else:
+        data = b"[]"
     
-    items_data = []
-    for item in items:
-        item_dict = item.model_dump()
-        # Convert datetime fields to ISO format strings
-        for field in datetime_fields:
-            if item_dict.get(field):
-                item_dict[field] = item_dict[field].isoformat()
-        items_data.append(item_dict)
+    # Write beside the target and rename so readers never see a partial file.
+    # The temp name is unique so concurrent writers can't clobber each other.
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=filepath.name, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+        # The data must be on disk before the rename, or a crash can leave
+        # the new name pointing at an empty or partial file
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    if sync_dir:
+        _fsync_dir(filepath.parent)
+
+
+def schedule_save(items, filepath):
+    """
+    Queue a snapshot write for the background flusher.
+    Repeated saves of the same file before the next flush collapse into one
+    write. Without a running flusher (tests, scripts) the file is written now.
     
-    with open(filepath, 'w') as f:
-        json.dump(items_data, f, indent=2)
+    Args:
+        items: List of Pydantic model instances
+        filepath: Path object for the JSON file
+    """
+    if not _write_behind_active:
+        save_to_json(items, filepath)
+        return
+    with _pending_lock:
+        _pending_saves[filepath] = list(items)
+
+
+def flush_pending_saves():
+    """Write every queued snapshot to disk, syncing each directory once per batch"""
+    with _pending_lock:
+        pending = list(_pending_saves.items())
+        _pending_saves.clear()
+    for filepath, items in pending:
+        save_to_json(items, filepath, sync_dir=False)
+    for dirpath in {filepath.parent for filepath, _ in pending}:
+        _fsync_dir(dirpath)
 
 
-def load_from_json(filepath, model_class, datetime_fields=None):
+async def run_write_behind(interval_seconds=FLUSH_INTERVAL_SECONDS):
+    """Background task: flush queued snapshot writes every few hundred milliseconds"""
+    global _write_behind_active
+    _write_behind_active = True
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.to_thread(flush_pending_saves)
+    finally:
+        _write_behind_active = False
+        flush_pending_saves()
+
+
+def load_from_json(filepath, model_class):
     """
     Generic load function for any Pydantic model list.
+    ISO 8601 datetime strings are parsed by the model schema.
     
     Args:
         filepath: Path object for the JSON file
         model_class: The Pydantic model class to instantiate
-        datetime_fields: List of field names that contain datetime objects
         
     Returns:
         List of model instances or None if file doesn't exist
@@ -59,24 +174,119 @@ def load_from_json(filepath, model_class, datetime_fields=None):
     if not filepath.exists():
         return None
     
-    datetime_fields = datetime_fields or []
-    
     try:
-        with open(filepath, 'r') as f:
-            items_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            if filepath.stat().st_size > STREAM_LOAD_THRESHOLD_BYTES:
+                # Build one model per record instead of holding the raw file too
+                return [
+                    model_class.model_validate(item_dict)
+                    for item_dict in ijson.items(f, 'item', use_float=True)
+                ]
+            return _list_adapter(model_class).validate_json(f.read())
+    except Exception as e:
+        print(f"Error loading {model_class.__name__}: {e}")
+        return None
+
+
+def append_to_journal(event, filepath):
+    """
+    Append a single event to a JSON-lines journal.
+    
+    Args:
+        event: JSON-serializable dict, e.g. {"op": "upsert", "item": {...}}
+        filepath: Path object for the journal file
         
+    Returns:
+        Number of events appended to the journal since it was last compacted
+    """
+    ensure_storage_dir()
+    line = orjson.dumps(event) + b"\n"
+    with _journal_lock:
+        with open(filepath, 'ab') as f:
+            f.write(line)
+        _journal_appends[filepath] = _journal_appends.get(filepath, 0) + 1
+        return _journal_appends[filepath]
+
+
+def compact_journal(items, snapshot_path, journal_path):
+    """
+    Write a full snapshot and truncate the journal it supersedes.
+    
+    Args:
+        items: Current in-memory list of model instances
+        snapshot_path: Path object for the JSON snapshot
+        journal_path: Path object for the journal file
+    """
+    with _journal_lock:
+        save_to_json(list(items), snapshot_path)
+        journal_path.unlink(missing_ok=True)
+        _journal_appends[journal_path] = 0
+
+
+def load_journaled(snapshot_path, journal_path, model_class):
+    """
+    Load a snapshot and apply its journal on top.
+    
+    A snapshot that exists but cannot be parsed is renamed to
+    <name>.corrupt-<timestamp> and the journal is replayed onto an empty
+    list, so the records it holds survive and the bad file stays on disk
+    for manual recovery.
+    
+    Returns:
+        List of model instances, or None if there is no snapshot (first run)
+    """
+    items = load_from_json(snapshot_path, model_class)
+    if items is None:
+        if not snapshot_path.exists():
+            return None
+        aside = snapshot_path.with_name(f"{snapshot_path.name}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}")
+        os.replace(snapshot_path, aside)
+        print(f"Moved unreadable {snapshot_path.name} to {aside.name}; rebuilding from {journal_path.name}")
         items = []
-        for item_dict in items_data:
-            # Convert ISO format strings back to datetime objects
-            for field in datetime_fields:
-                if item_dict.get(field):
-                    item_dict[field] = datetime.fromisoformat(item_dict[field])
-            items.append(model_class(**item_dict))
+    return replay_journal(items, journal_path, model_class)
+
+
+def replay_journal(items, filepath, model_class):
+    """
+    Apply journal events on top of a loaded snapshot.
+    
+    Args:
+        items: List of model instances loaded from the snapshot
+        filepath: Path object for the journal file
+        model_class: The Pydantic model class to instantiate
         
+    Returns:
+        New list of model instances with every journal event applied
+    """
+    if not filepath.exists():
         return items
-    except Exception as e:
-        print(f"Error loading {model_class.__name__}: {e}")
-        return None
+    
+    events = []
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                events.append(orjson.loads(line))
+            except ValueError:
+                # Torn final line from an interrupted write - nothing after it
+                print(f"Ignoring truncated entry in {filepath.name}")
+                break
+    
+    # Validate every upserted record in one pydantic-core call
+    upserted = iter(_list_adapter(model_class).validate_python(
+        [event["item"] for event in events if event["op"] == "upsert"]
+    ))
+    
+    by_id = {item.id: item for item in items}
+    for event in events:
+        if event["op"] == "upsert":
+            item = next(upserted)
+            by_id[item.id] = item
+        elif event["op"] == "delete":
+            by_id.pop(event["id"], None)
+    
+    return list(by_id.values())
 
 
 # ============================================================================
@@ -85,53 +295,142 @@ def load_from_json(filepath, model_class, datetime_fields=None):
 
 def save_users(users):
     """Save users to JSON file"""
-    save_to_json(users, USERS_FILE, datetime_fields=['locked_until'])
+    schedule_save(users, USERS_FILE)
 
 
 def load_users():
     """Load users from JSON file"""
-    from .data import User
-    return load_from_json(USERS_FILE, User, datetime_fields=['locked_until'])
+    return load_from_json(USERS_FILE, _models().User)
 
 
 def save_rooms(rooms):
     """Save rooms to JSON file"""
-    save_to_json(rooms, ROOMS_FILE)
+    schedule_save(rooms, ROOMS_FILE)
 
 
 def load_rooms():
     """Load rooms from JSON file"""
-    from .data import Room
-    return load_from_json(ROOMS_FILE, Room)
+    return load_from_json(ROOMS_FILE, _models().Room)
 
 
 def save_bookings(bookings):
     """Save bookings to JSON file"""
-    save_to_json(bookings, BOOKINGS_FILE, datetime_fields=['start_time', 'end_time'])
+    save_to_json(bookings, BOOKINGS_FILE)
 
 
 def load_bookings():
-    """Load bookings from JSON file"""
-    from .data import Booking
-    return load_from_json(BOOKINGS_FILE, Booking, datetime_fields=['start_time', 'end_time'])
+    """Load bookings from the JSON snapshot plus any journaled changes"""
+    return load_journaled(BOOKINGS_FILE, BOOKINGS_JOURNAL, _models().Booking)
+
+
+def journal_booking(booking):
+    """Record a created or updated booking in the bookings journal"""
+    _append_booking_event({"op": "upsert", "item": booking.model_dump(mode="json")})
+
+
+def journal_booking_deleted(booking_id):
+    """Record a deleted booking in the bookings journal"""
+    _append_booking_event({"op": "delete", "id": booking_id})
+
+
+def compact_bookings(bookings):
+    """Write a full bookings snapshot and truncate the journal"""
+    compact_journal(bookings, BOOKINGS_FILE, BOOKINGS_JOURNAL)
+
+
+def _append_booking_event(event):
+    """Journal a bookings event, compacting once the journal grows past the threshold"""
+    if append_to_journal(event, BOOKINGS_JOURNAL) >= COMPACTION_APPEND_THRESHOLD:
+        if _compaction_active:
+            _bookings_compaction_due.set()
+        else:
+            from .data import BOOKINGS
+            compact_bookings(BOOKINGS)
 
 
 def save_notifications(notifications):
     """Save notifications to JSON file"""
-    save_to_json(notifications, NOTIFICATIONS_FILE, datetime_fields=['created_at'])
+    schedule_save(notifications, NOTIFICATIONS_FILE)
 
 
 def load_notifications():
-    """Load notifications from JSON file"""
-    from .data import Notification
-    return load_from_json(NOTIFICATIONS_FILE, Notification, datetime_fields=['created_at'])
+    """Load notifications from the JSON snapshot plus any journaled changes"""
+    return load_journaled(NOTIFICATIONS_FILE, NOTIFICATIONS_JOURNAL, _models().Notification)
+
+
+def journal_notification(notification):
+    """Record a created or updated notification in the notifications journal"""
+    _append_notification_event({"op": "upsert", "item": notification.model_dump(mode="json")})
+
+
+def journal_notification_deleted(notification_id):
+    """Record a deleted notification in the notifications journal"""
+    _append_notification_event({"op": "delete", "id": notification_id})
+
+
+def compact_notifications(notifications):
+    """Write a full notifications snapshot and truncate the journal"""
+    compact_journal(notifications, NOTIFICATIONS_FILE, NOTIFICATIONS_JOURNAL)
+
+
+def _append_notification_event(event):
+    """Journal a notifications event, compacting once the journal grows past the threshold"""
+    if append_to_journal(event, NOTIFICATIONS_JOURNAL) >= COMPACTION_APPEND_THRESHOLD:
+        if _compaction_active:
+            _notifications_compaction_due.set()
+        else:
+            from .data import NOTIFICATIONS
+            compact_notifications(NOTIFICATIONS)
+
+
+async def run_periodic_compaction(interval_minutes=COMPACTION_INTERVAL_MINUTES,
+                                  check_seconds=COMPACTION_CHECK_SECONDS):
+    """
+    Background task: fold the journals into their snapshots every few
+    minutes, and sooner for a journal that has passed the append threshold.
+    Compaction runs on a worker thread so the event loop keeps serving.
+    """
+    from .data import BOOKINGS, NOTIFICATIONS
+    global _compaction_active
+    _compaction_active = True
+    last_full = time.monotonic()
+    try:
+        while True:
+            await asyncio.sleep(check_seconds)
+            full = time.monotonic() - last_full >= interval_minutes * 60
+            if full:
+                last_full = time.monotonic()
+            if full or _bookings_compaction_due.is_set():
+                _bookings_compaction_due.clear()
+                await asyncio.to_thread(compact_bookings, BOOKINGS)
+            if full or _notifications_compaction_due.is_set():
+                _notifications_compaction_due.clear()
+                await asyncio.to_thread(compact_notifications, NOTIFICATIONS)
+    finally:
+        _compaction_active = False
+
+
+def install_default_files():
+    """Copy the shipped default snapshot for any storage file that doesn't exist yet"""
+    ensure_storage_dir()
+    for filepath in (USERS_FILE, ROOMS_FILE, BOOKINGS_FILE, NOTIFICATIONS_FILE):
+        default = DEFAULTS_DIR / filepath.name
+        if not filepath.exists() and default.exists():
+            shutil.copyfile(default, filepath)
+            print(f"Installed default {filepath.name}")
 
 
 def initialize_storage():
     """
     Initialize storage - load from files or create with defaults
     """
-    from .data import USERS, ROOMS, BOOKINGS, NOTIFICATIONS
+    from .data import (
+        USERS, ROOMS, BOOKINGS, NOTIFICATIONS,
+        reset_id_counters, rebuild_user_index, rebuild_booking_index, rebuild_notification_indexes,
+    )
+    
+    # First run: start from the pre-built default files when they're shipped
+    install_default_files()
     
     # Load users
     loaded_users = load_users()
@@ -159,8 +458,12 @@ def initialize_storage():
         BOOKINGS.clear()
         BOOKINGS.extend(loaded_bookings)
         print(f"Loaded {len(loaded_bookings)} bookings from storage")
+        if not BOOKINGS_FILE.exists():
+            # Rebuilt from the journal after a corrupt snapshot was set aside;
+            # write it out so the next start doesn't take it for a first run
+            compact_bookings(BOOKINGS)
     else:
-        save_bookings(BOOKINGS)
+        compact_bookings(BOOKINGS)
         print(f"Initialized storage with {len(BOOKINGS)} default bookings")
     
     # Load notifications
@@ -169,6 +472,15 @@ def initialize_storage():
         NOTIFICATIONS.clear()
         NOTIFICATIONS.extend(loaded_notifications)
         print(f"Loaded {len(loaded_notifications)} notifications from storage")
+        if not NOTIFICATIONS_FILE.exists():
+            # Rebuilt from the journal after a corrupt snapshot was set aside
+            compact_notifications(NOTIFICATIONS)
     else:
-        save_notifications(NOTIFICATIONS)
-        print(f"Initialized storage with {len(NOTIFICATIONS)} default notifications")
\ No newline at end of file
+        compact_notifications(NOTIFICATIONS)
+        print(f"Initialized storage with {len(NOTIFICATIONS)} default notifications")
+    
+    # Continue id sequences and rebuild lookup indexes from whatever was loaded
+    reset_id_counters()
+    rebuild_user_index()
+    rebuild_booking_index()
+    rebuild_notification_indexes()
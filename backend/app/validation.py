@@ -8,22 +8,28 @@ Provides centralized validation for:
 - Date/time formats
 """
 import re
+from functools import lru_cache
+from typing import Final
 from fastapi import HTTPException
 
 # Validation constants
-MAX_NAME_LENGTH = 100
-MAX_TITLE_LENGTH = 200
-MAX_NOTES_LENGTH = 2000
-MAX_EMAIL_LENGTH = 254
-MIN_PASSWORD_LENGTH = 8
-MAX_PASSWORD_LENGTH = 128
-VALID_ROLES = ["attendee", "organiser"]
-ROLE_ALIASES = {
+MAX_NAME_LENGTH: Final = 100
+MAX_TITLE_LENGTH: Final = 200
+MAX_NOTES_LENGTH: Final = 2000
+MAX_EMAIL_LENGTH: Final = 254
+MIN_PASSWORD_LENGTH: Final = 8
+MAX_PASSWORD_LENGTH: Final = 128
+VALID_ROLES: Final[frozenset[str]] = frozenset({"attendee", "organiser"})
+ROLE_ALIASES: Final[dict[str, str]] = {
     "student": "attendee",  # backwards compatibility with earlier iteration
 }
+# Every accepted (lowercase) role spelling mapped to its canonical role
+_ROLE_MAP: Final[dict[str, str]] = {role: role for role in VALID_ROLES} | ROLE_ALIASES
+_INVALID_ROLE_DETAIL: Final = f"Invalid role. Must be one of: {', '.join(sorted(VALID_ROLES))}"
 
-# Email regex pattern (RFC 5322 simplified)
-EMAIL_PATTERN = re.compile(
+# Email regex pattern (RFC 5322 simplified). Matched from the start only,
+# and input is capped at MAX_EMAIL_LENGTH first, so backtracking stays linear.
+EMAIL_PATTERN: Final[re.Pattern[str]] = re.compile(
     r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 )
 
@@ -41,22 +47,30 @@ def validate_email(email: str) -> str:
     Raises:
         HTTPException: If email is invalid
     """
-    if not email:
-        raise HTTPException(status_code=400, detail="Email is required")
-    
-    email = email.strip().lower()
-    
-    if len(email) > MAX_EMAIL_LENGTH:
+    # Length first, so oversized input is never hashed, lowercased or cached
+    if email and len(email.strip()) > MAX_EMAIL_LENGTH:
         raise HTTPException(
-            status_code=400, 
+            status_code=400,
             detail=f"Email must be at most {MAX_EMAIL_LENGTH} characters"
         )
     
-    if not EMAIL_PATTERN.match(email):
-        raise HTTPException(
-            status_code=400, 
-            detail="Invalid email format"
-        )
+    try:
+        return _normalize_email(email)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_email(email: str) -> str:
+    """Cached core of validate_email; raises ValueError with the error detail"""
+    if not email:
+        raise ValueError("Email is required")
+    
+    email = email.strip().lower()
+    
+    # Cheap rejections before engaging the regex; the pattern refuses these anyway
+    if email.count("@") != 1 or not email.isascii() or not EMAIL_PATTERN.match(email):
+        raise ValueError("Invalid email format")
     
     return email
 
@@ -145,6 +159,8 @@ def validate_notes(notes: str | None) -> str | None:
         return None
     
     notes = notes.strip()
+    if not notes:
+        return None
     
     if len(notes) > MAX_NOTES_LENGTH:
         raise HTTPException(
@@ -152,7 +168,7 @@ def validate_notes(notes: str | None) -> str | None:
             detail=f"Notes must be at most {MAX_NOTES_LENGTH} characters"
         )
     
-    return notes if notes else None
+    return notes
 
 
 def validate_password(password: str) -> str:
@@ -192,17 +208,21 @@ def validate_role(role: str) -> str:
     - attendee
     - organiser
     """
+    try:
+        return _normalize_role(role)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@lru_cache(maxsize=64)
+def _normalize_role(role: str) -> str:
+    """Cached core of validate_role; raises ValueError with the error detail"""
     if not role:
         return "attendee"
     
-    role = role.strip().lower()
-    normalized_role = ROLE_ALIASES.get(role, role)
-    
-    if normalized_role not in VALID_ROLES:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}"
-        )
+    normalized_role = _ROLE_MAP.get(role.strip().lower())
+    if normalized_role is None:
+        raise ValueError(_INVALID_ROLE_DETAIL)
     
     return normalized_role
 
@@ -221,10 +241,5 @@ def sanitize_string(value: str | None) -> str | None:
     if value is None:
         return None
     
-    # Remove null bytes (security measure)
-    value = value.replace('\x00', '')
-    
-    # Normalize whitespace
-    value = ' '.join(value.split())
-    
-    return value if value else None
+    # Remove null bytes (security measure), then normalize whitespace
+    return ' '.join(value.replace('\x00', '').split()) or None
@@ -1,9 +1,21 @@
+import sys
+
 import uvicorn
 
 
 def main() -> None:
     """Run the FastAPI development server with automatic reload."""
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        # uvloop and httptools come with uvicorn[standard]; uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Data lives in per-process lists, so a second worker would diverge
+        workers=1,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+"""
+Regenerate the default data files shipped in app/data/defaults.
+
+initialize_storage() copies these into place on first run instead of
+serializing the seed lists from app/data.py. Re-run after changing the
+seed data:
+
+    cd backend
+    python scripts/build_defaults.py
+"""
+import sys
+from pathlib import Path
+
+# Make the backend package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.data import USERS, ROOMS, BOOKINGS, NOTIFICATIONS
+from app.storage import (
+    DEFAULTS_DIR, USERS_FILE, ROOMS_FILE, BOOKINGS_FILE, NOTIFICATIONS_FILE, save_to_json,
+)
+
+
+def main() -> None:
+    """Write each seed list to its default snapshot file."""
+    DEFAULTS_DIR.mkdir(parents=True, exist_ok=True)
+    for items, filepath in (
+        (USERS, USERS_FILE),
+        (ROOMS, ROOMS_FILE),
+        (BOOKINGS, BOOKINGS_FILE),
+        (NOTIFICATIONS, NOTIFICATIONS_FILE),
+    ):
+        target = DEFAULTS_DIR / filepath.name
+        save_to_json(items, target, pretty=True)
+        print(f"Wrote {len(items)} records to {target}")
+
+
+if __name__ == "__main__":
+    main()
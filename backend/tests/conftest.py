@@ -6,37 +6,414 @@ Provides:
 - Authentication helper fixtures  
 - Test data setup/teardown
 """
+import copy
+import hashlib
+import hmac
+import itertools
+import time
+import zlib
+from datetime import datetime, timedelta
 import pytest
+import freezegun
+import pytest_asyncio
+from freezegun import freeze_time
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
 import sys
 from pathlib import Path
 
 # Ensure the backend package is importable when running tests from varied working dirs
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from app import app
-from app.data import USERS, BOOKINGS, ROOMS, NOTIFICATIONS
+from app import app, auth, storage
+from app.auth import create_access_token, verify_token
+from app.data import (
+    USERS, USERS_BY_EMAIL, BOOKINGS, BOOKINGS_BY_ID, ROOMS, NOTIFICATIONS, Booking, User,
+    next_id, rebuild_user_index, rebuild_booking_index, rebuild_notification_indexes,
+)
 
 
-@pytest.fixture(scope="function")
-def client():
-    """Create a test client for each test"""
-    return TestClient(app)
+# Keep pytest's own timers (--durations) on the real clock while time is frozen
+freezegun.configure(extend_ignore_list=["_pytest"])
+
+
+# Plaintext passwords of the seed users in app/data.py
+SEED_PASSWORDS = {
+    "alicejohnson@st-andrews.ac.uk": "password123",
+    "benlee@st-andrews.ac.uk": "password012!",
+    "chloesmith@st-andrews.ac.uk": "password2025",
+}
+
+
+# Storage file paths redirected away from app/data for the test session
+STORAGE_PATHS = (
+    "USERS_FILE", "ROOMS_FILE", "BOOKINGS_FILE", "NOTIFICATIONS_FILE",
+    "BOOKINGS_JOURNAL", "NOTIFICATIONS_JOURNAL",
+)
+
+
+def _fast_hash_password(password):
+    """SHA-256 stand-in for bcrypt - the API tests don't need a slow KDF"""
+    return "sha256$" + hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def _fast_verify_password(plain_password, hashed_password):
+    return hmac.compare_digest(_fast_hash_password(plain_password), hashed_password)
+
+
+@pytest.fixture(scope="session")
+def client(tmp_path_factory):
+    """
+    One test client for the whole session, entered as a context manager so
+    the app lifespan (storage load, background tasks, shutdown compaction)
+    runs exactly once. Storage files are redirected to a temporary directory,
+    seeded from the shipped defaults, so tests never touch app/data.
+    """
+    storage_dir = tmp_path_factory.mktemp("storage")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(storage, "STORAGE_DIR", storage_dir)
+        for name in STORAGE_PATHS:
+            mp.setattr(storage, name, storage_dir / getattr(storage, name).name)
+        with TestClient(app) as test_client:
+            yield test_client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def aclient(client):
+    """
+    Async client calling the app directly over ASGI: no portal thread hop
+    per request, and independent requests can be fired concurrently with
+    asyncio.gather. Depends on client so the app has already started up.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def minimum_bcrypt_cost():
+    """Hash at bcrypt's minimum cost: test_auth.py checks hashing behaviour, not its strength"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth, "BCRYPT_ROUNDS", 4)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing(client):
+    """
+    Swap bcrypt out of the register/login routes for the test session.
+    The seed users (as loaded by the app's startup) are re-hashed to match.
+    app.auth itself is untouched, so test_auth.py still exercises the real
+    bcrypt functions.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.routes.hash_password", _fast_hash_password)
+        mp.setattr("app.routes.verify_password", _fast_verify_password)
+        for user in USERS:
+            if user.email in SEED_PASSWORDS:
+                mp.setattr(user, "password_hash", _fast_hash_password(SEED_PASSWORDS[user.email]))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolate_state():
+    """
+    Roll ROOMS, BOOKINGS and NOTIFICATIONS (and their indexes) back to their
+    pre-test state, even when the test fails. Items are deep-copied, so
+    in-place updates (e.g. update_booking) are undone too. USERS is left
+    alone so session-scoped accounts stay valid.
+    """
+    saved = [
+        (items, [item.model_copy(deep=True) for item in items])
+        for items in (ROOMS, BOOKINGS, NOTIFICATIONS)
+    ]
+    yield
+    for items, original in saved:
+        items[:] = original
+    rebuild_booking_index()
+    rebuild_notification_indexes()
 
 
 @pytest.fixture(scope="function")
-def auth_headers(client):
-    """Get authentication headers for the default test user"""
+def db_snapshot():
+    """Restore the in-memory data lists (and their indexes) after the test"""
+    saved = [(items, copy.deepcopy(items)) for items in (USERS, ROOMS, BOOKINGS, NOTIFICATIONS)]
+    yield
+    # Restore in place - routes and storage hold references to these lists
+    for items, original in saved:
+        items[:] = original
+    rebuild_user_index()
+    rebuild_booking_index()
+    rebuild_notification_indexes()
+
+
+def _login(client, email):
+    """Log in as a seed user and return the access token"""
     response = client.post("/auth/login", json={
-        "email": "alicejohnson@st-andrews.ac.uk",
-        "password": "password123"
+        "email": email,
+        "password": SEED_PASSWORDS[email]
     })
     
     if response.status_code == 200:
-        token = response.json()["token"]
-        return {"Authorization": f"Bearer {token}"}
+        return response.json()["token"]
     
     # If login fails, skip tests that need auth
-    pytest.skip("Could not authenticate default user")
+    pytest.skip(f"Could not authenticate {email}")
+
+
+@pytest.fixture(scope="session")
+def sample_token():
+    """A token for user 42 / user@test.com, signed once per session"""
+    return create_access_token(42, "user@test.com")
+
+
+# A cached token is only reused if it has at least this long left to live
+TOKEN_REUSE_MIN_SECONDS = 10 * 60
+
+
+def _token_reusable(token, email):
+    """True if token still verifies, belongs to email's user and won't expire mid-run"""
+    token_data = verify_token(token)
+    user = USERS_BY_EMAIL.get(email)
+    if token_data is None or user is None or token_data.user_id != user.id:
+        return False
+    return jwt.get_unverified_claims(token)["exp"] - time.time() > TOKEN_REUSE_MIN_SECONDS
+
+
+def _cached_login(pytestconfig, client, email):
+    """
+    Like _login, but reuse a still-valid token from an earlier run via
+    pytest's cache (.pytest_cache), so back-to-back runs skip the login.
+    """
+    cache = getattr(pytestconfig, "cache", None)  # absent with -p no:cacheprovider
+    key = f"auth/token/{email}"
+    token = cache.get(key, None) if cache else None
+    if token and _token_reusable(token, email):
+        return token
+    token = _login(client, email)
+    if cache:
+        cache.set(key, token)
+    return token
+
+
+@pytest.fixture(scope="session")
+def alice_token(pytestconfig, client):
+    """Log in as Alice (organiser) once per session, or reuse a cached token"""
+    return _cached_login(pytestconfig, client, "alicejohnson@st-andrews.ac.uk")
+
+
+# Read-only or rejected-by-validation requests that touch each route family
+WARMUP_REQUESTS = (
+    ("GET", "/health"),
+    ("POST", "/auth/register"),
+    ("POST", "/auth/login"),
+    ("GET", "/rooms"),
+    ("GET", "/bookings/upcoming"),
+    ("POST", "/bookings"),
+    ("GET", "/notifications"),
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warmup(client, alice_token):
+    """
+    Pay the lazy first-request costs (OpenAPI schema, route validators and
+    serializers) once up front instead of in whichever test runs first.
+    None of the requests change any data.
+    """
+    app.openapi()
+    headers = {"Authorization": f"Bearer {alice_token}"}
+    for method, path in WARMUP_REQUESTS:
+        client.request(method, path, json={}, headers=headers)
+
+
+@pytest.fixture(scope="session")
+def ben_token(pytestconfig, client):
+    """Log in as Ben (attendee) once per session, or reuse a cached token"""
+    return _cached_login(pytestconfig, client, "benlee@st-andrews.ac.uk")
+
+
+@pytest.fixture(scope="function")
+def auth_headers(alice_token):
+    """Get authentication headers for the default test user"""
+    return {"Authorization": f"Bearer {alice_token}"}
+
+
+@pytest.fixture(scope="function")
+def ben_headers(ben_token):
+    """Get authentication headers for the default attendee"""
+    return {"Authorization": f"Bearer {ben_token}"}
+
+
+# Per-process counter: each session (and xdist worker) starts from empty storage
+_unique_ids = itertools.count(1)
+
+
+def _unique_id():
+    """Next unused id for test accounts, e.g. "0000002a" """
+    return f"{next(_unique_ids):08x}"
+
+
+def make_unique_email(prefix="user"):
+    """Build an email address no other test has registered"""
+    return f"{prefix}_{_unique_id()}@test.com"
+
+
+def _register_attendee(client, prefix):
+    """Register a new attendee and return bearer auth headers"""
+    response = client.post("/auth/register", json={
+        "name": "Test Attendee",
+        "email": make_unique_email(prefix),
+        "password": "attendeepass123",
+        "role": "attendee"
+    })
+    assert response.status_code == 201
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def _seed_attendee(email):
+    """
+    Add an attendee straight to USERS, bypassing /auth/register and hashing.
+    Use for helper users that never log in.
+    """
+    user = User(
+        id=next_id("user"),
+        name="Seeded Attendee",
+        email=email,
+        role="attendee",
+        password_hash="x",
+    )
+    USERS.append(user)
+    USERS_BY_EMAIL[user.email] = user
+    return user
+
+
+@pytest.fixture
+def unique_email():
+    """Factory for unique test email addresses, e.g. unique_email("logintest")"""
+    return make_unique_email
+
+
+@pytest.fixture
+def register_attendee(client):
+    """Factory that registers a fresh attendee and returns their auth headers"""
+    return lambda prefix="attendee": _register_attendee(client, prefix)
+
+
+@pytest.fixture
+def seed_attendee():
+    """Factory that adds an attendee in-process (no HTTP, no hashing) and returns the User"""
+    return _seed_attendee
+
+
+USER_POOL_SIZE = 4
+POOL_PASSWORD = "poolpass12345"
+
+
+@pytest.fixture(scope="session")
+def user_pool(client):
+    """Attendees registered once per session; credentials as {"email", "password"}"""
+    pool = []
+    for _ in range(USER_POOL_SIZE):
+        email = make_unique_email("pool")
+        response = client.post("/auth/register", json={
+            "name": "Pool User",
+            "email": email,
+            "password": POOL_PASSWORD,
+            "role": "attendee"
+        })
+        assert response.status_code == 201
+        pool.append({"email": email, "password": POOL_PASSWORD})
+    return pool
+
+
+@pytest.fixture
+def pooled_user(user_pool, request):
+    """
+    An already-registered attendee for tests that just need "some user".
+    Picked by test id so it's stable across runs. Shared between tests, so
+    don't use it for failed-login tests (lockout would leak).
+    """
+    return user_pool[zlib.crc32(request.node.nodeid.encode()) % len(user_pool)]
+
+
+@pytest.fixture(scope="session")
+def public_attendee_headers(client):
+    """Register one attendee for the session, for public booking tests"""
+    return _register_attendee(client, "public_attendee")
+
+
+@pytest.fixture(scope="function")
+def fresh_auth_headers(client):
+    """Get headers from a new login, for tests that need their own token"""
+    return {"Authorization": f"Bearer {_login(client, 'alicejohnson@st-andrews.ac.uk')}"}
+
+
+def _make_booking(**fields):
+    """Append a Booking to BOOKINGS without going through the routes; returns its id"""
+    fields.setdefault("organiser_id", 1)
+    fields.setdefault("title", "Seeded Booking")
+    booking = Booking(id=next_id("booking"), **fields)
+    BOOKINGS.append(booking)
+    BOOKINGS_BY_ID[booking.id] = booking
+    return booking.id
+
+
+@pytest.fixture
+def make_booking():
+    """
+    Factory for setup bookings, e.g. make_booking(room_id=6, start_time=..., end_time=...).
+    Skips route validation and HTTP; isolate_state removes them afterwards.
+    """
+    return _make_booking
+
+
+@pytest.fixture
+def alice_booking():
+    """
+    Id of a booking organised by Alice (user 1) in room 5 on 2030-12-20,
+    09:00-10:00, seeded in-process. isolate_state removes it afterwards.
+    """
+    return _make_booking(
+        room_id=5,
+        title="Alice's Meeting",
+        start_time=datetime(2030, 12, 20, 9, 0),
+        end_time=datetime(2030, 12, 20, 10, 0),
+    )
+
+
+FIXED_NOW = datetime(2026, 4, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def frozen_time():
+    """Freeze the clock at FIXED_NOW; the yielded factory can tick() or move_to()"""
+    with freeze_time(FIXED_NOW) as frozen:
+        yield frozen
+
+
+@pytest.fixture
+def reminder_booking(frozen_time):
+    """
+    Confirmed booking (organiser Alice, attendee Ben) starting an hour after
+    the frozen clock, with no reminder sent yet. isolate_state removes it afterwards.
+    """
+    start = frozen_time() + timedelta(hours=1)
+    booking = Booking(
+        id=next_id("booking"),
+        room_id=1,
+        organiser_id=1,
+        attendee_ids=[2],
+        pending_attendee_ids=[],
+        title="Reminder Test",
+        notes=None,
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        status="confirmed",
+        reminder_sent=False,
+    )
+    BOOKINGS.append(booking)
+    BOOKINGS_BY_ID[booking.id] = booking
+    return booking
 
 
 @pytest.fixture(scope="function")
@@ -57,8 +434,7 @@ def test_booking_data():
 @pytest.fixture(scope="function")
 def test_user_data():
     """Sample user registration data"""
-    import uuid
-    unique_id = str(uuid.uuid4())[:8]
+    unique_id = _unique_id()
     return {
         "name": f"Test User {unique_id}",
         "email": f"testuser_{unique_id}@test.com",
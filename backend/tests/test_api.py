@@ -2,22 +2,33 @@
 Integration tests for API endpoints
 Tests include valid requests, invalid requests, and malicious input
 """
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 import pytest
-from fastapi.testclient import TestClient
-from app import app
-from app.data import ROOMS, BOOKINGS, NOTIFICATIONS, Booking
+from app.data import ROOMS, BOOKINGS, NOTIFICATIONS
 from app.routes import create_notification, process_booking_reminders
 
-client = TestClient(app)
+# Acceptable status codes for "handled gracefully" assertions
+VALIDATION_ERROR = frozenset({400, 422})
+UNAUTHORIZED_OR_INVALID = frozenset({401, 422})
+CREATED_OR_REJECTED = frozenset({201, 400, 422})
+CREATED_REJECTED_OR_NOT_FOUND = frozenset({201, 400, 404, 422})
+
+# Labelled attack strings; the labels become test ids (e.g. -k sql_drop)
+MALICIOUS_PAYLOADS = [
+    ("sql_drop", "'; DROP TABLE users; --"),
+    ("sql_or", "admin' OR '1'='1"),
+    ("xss", "<script>alert('xss')</script>"),
+    ("path", "../../etc/passwd"),
+]
 
 
 class TestHealthEndpoint:
     """Test health check endpoint"""
     
-    def test_health_check(self):
+    async def test_health_check(self, aclient):
         """Test basic health check"""
-        response = client.get("/health")
+        response = await aclient.get("/health")
         assert response.status_code == 200
         assert response.json() == {"status": "ok"}
 
@@ -25,13 +36,12 @@ class TestHealthEndpoint:
 class TestAuthEndpoints:
     """Test authentication endpoints with various inputs"""
     
-    def test_register_valid_user(self):
+    def test_register_valid_user(self, client, unique_email):
         """Test registering a new user with valid data"""
-        import uuid
-        unique_email = f"newuser_{uuid.uuid4().hex[:8]}@test.com"
+        email = unique_email("newuser")
         response = client.post("/auth/register", json={
             "name": "Test User",
-            "email": unique_email,
+            "email": email,
             "password": "secure_password123",  # At least 8 chars
             "role": "attendee"
         })
@@ -40,15 +50,13 @@ class TestAuthEndpoints:
         data = response.json()
         assert "token" in data
         assert "user" in data
-        assert data["user"]["email"] == unique_email
+        assert data["user"]["email"] == email
     
-    def test_register_duplicate_email(self):
+    def test_register_duplicate_email(self, client, unique_email):
         """Test that duplicate email registration fails gracefully"""
-        import uuid
-        unique_email = f"duplicate_{uuid.uuid4().hex[:8]}@test.com"
         user_data = {
             "name": "Duplicate User",
-            "email": unique_email,
+            "email": unique_email("duplicate"),
             "password": "password12345",  # At least 8 chars
             "role": "attendee"
         }
@@ -62,20 +70,33 @@ class TestAuthEndpoints:
         assert response2.status_code == 409  # Conflict
         assert "already registered" in response2.json()["detail"].lower()
     
-    def test_register_missing_fields(self):
-        """Test registration with missing required fields"""
-        invalid_requests = [
-            {},  # Empty
-            {"name": "Test"},  # Missing email and password
-            {"email": "test@test.com"},  # Missing name and password
-            {"name": "Test", "email": "test@test.com"},  # Missing password
-        ]
+    async def test_concurrent_registrations_get_distinct_ids(self, aclient, unique_email):
+        """Registrations arriving together each get their own user id"""
+        responses = await asyncio.gather(*[
+            aclient.post("/auth/register", json={
+                "name": "Concurrent User",
+                "email": unique_email("concurrent"),
+                "password": "password12345",  # At least 8 chars
+                "role": "attendee"
+            })
+            for _ in range(5)
+        ])
         
-        for request_data in invalid_requests:
-            response = client.post("/auth/register", json=request_data)
-            assert response.status_code == 422  # Validation error
+        assert [r.status_code for r in responses] == [201] * 5
+        assert len({r.json()["user"]["id"] for r in responses}) == 5
     
-    def test_register_invalid_email(self):
+    @pytest.mark.parametrize("request_data", [
+        {},  # Empty
+        {"name": "Test"},  # Missing email and password
+        {"email": "test@test.com"},  # Missing name and password
+        {"name": "Test", "email": "test@test.com"},  # Missing password
+    ])
+    def test_register_missing_fields(self, client, request_data):
+        """Test registration with missing required fields"""
+        response = client.post("/auth/register", json=request_data)
+        assert response.status_code == 422  # Validation error
+    
+    def test_register_invalid_email(self, client):
         """Test registration with invalid email format"""
         response = client.post("/auth/register", json={
             "name": "Test User",
@@ -84,52 +105,46 @@ class TestAuthEndpoints:
             "role": "attendee"
         })
         # Server should reject with 400 (bad request) or 422 (validation error)
-        assert response.status_code in [400, 422]
+        assert response.status_code in VALIDATION_ERROR
     
-    def test_register_sql_injection_attempt(self):
-        """Test that SQL injection attempts are handled safely"""
-        malicious_inputs = [
-            "'; DROP TABLE users; --",
-            "admin' OR '1'='1",
-            "<script>alert('xss')</script>",
-            "../../etc/passwd"
-        ]
-        
-        for malicious in malicious_inputs:
-            response = client.post("/auth/register", json={
-                "name": malicious,
-                "email": f"{malicious}@test.com",
-                "password": malicious,
-                "role": "attendee"
-            })
-            # Should not crash - either accept or reject gracefully
-            assert response.status_code in [201, 400, 422]
-    
-    def test_login_valid_credentials(self):
-        """Test login with valid credentials"""
-        import uuid
-        unique_email = f"logintest_{uuid.uuid4().hex[:8]}@test.com"
-        
-        # First register a user
-        client.post("/auth/register", json={
-            "name": "Login Test User",
-            "email": unique_email,
-            "password": "testpass12345",  # At least 8 chars
+    def test_register_normalizes_email(self, client, unique_email):
+        """Test padded, mixed-case emails are stored stripped and lowercased"""
+        email = unique_email("normalize")
+        response = client.post("/auth/register", json={
+            "name": "Test User",
+            "email": f"  {email.upper()}  ",
+            "password": "password12345",  # At least 8 chars
             "role": "attendee"
         })
         
-        # Then try to login
-        response = client.post("/auth/login", json={
-            "email": unique_email,
-            "password": "testpass12345"
+        assert response.status_code == 201
+        assert response.json()["user"]["email"] == email
+    
+    @pytest.mark.parametrize("malicious, email", [
+        pytest.param(payload, f"{payload}@test.com", id=label)
+        for label, payload in MALICIOUS_PAYLOADS
+    ])
+    def test_register_sql_injection_attempt(self, client, malicious, email):
+        """Test that SQL injection attempts are handled safely"""
+        response = client.post("/auth/register", json={
+            "name": malicious,
+            "email": email,
+            "password": malicious,
+            "role": "attendee"
         })
+        # Should not crash - either accept or reject gracefully
+        assert response.status_code in CREATED_OR_REJECTED
+    
+    def test_login_valid_credentials(self, client, pooled_user):
+        """Test login with valid credentials"""
+        response = client.post("/auth/login", json=pooled_user)
         
         assert response.status_code == 200
         data = response.json()
         assert "token" in data
         assert "user" in data
     
-    def test_login_invalid_password(self):
+    def test_login_invalid_password(self, client):
         """Test login with wrong password"""
         response = client.post("/auth/login", json={
             "email": "alicejohnson@st-andrews.ac.uk",
@@ -139,7 +154,7 @@ class TestAuthEndpoints:
         assert response.status_code == 401
         assert "invalid" in response.json()["detail"].lower()
     
-    def test_login_nonexistent_user(self):
+    def test_login_nonexistent_user(self, client):
         """Test login with non-existent email"""
         response = client.post("/auth/login", json={
             "email": "doesnotexist@test.com",
@@ -148,32 +163,26 @@ class TestAuthEndpoints:
         
         assert response.status_code == 401
     
-    def test_login_missing_credentials(self):
+    @pytest.mark.parametrize("login_data", [
+        {},
+        {"email": "test@test.com"},  # Missing password
+        {"password": "test"},  # Missing email
+    ])
+    def test_login_missing_credentials(self, client, login_data):
         """Test login with missing credentials"""
-        invalid_logins = [
-            {},
-            {"email": "test@test.com"},  # Missing password
-            {"password": "test"},  # Missing email
-        ]
-        
-        for login_data in invalid_logins:
-            response = client.post("/auth/login", json=login_data)
-            assert response.status_code == 422
+        response = client.post("/auth/login", json=login_data)
+        assert response.status_code == 422
 
 
 class TestRoomsEndpoints:
     """Test room-related endpoints"""
     
-    def setup_method(self):
-        """Get auth token for protected endpoints"""
-        response = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
-        self.token = response.json()["token"]
-        self.headers = {"Authorization": f"Bearer {self.token}"}
+    @pytest.fixture(autouse=True)
+    def _headers(self, auth_headers):
+        """Auth headers for protected endpoints (login cached per session)"""
+        self.headers = auth_headers
     
-    def test_list_rooms_authenticated(self):
+    def test_list_rooms_authenticated(self, client):
         """Test listing rooms with authentication"""
         response = client.get("/rooms", headers=self.headers)
         
@@ -181,52 +190,97 @@ class TestRoomsEndpoints:
         rooms = response.json()
         assert isinstance(rooms, list)
         assert len(rooms) > 0
-    
-    def test_list_rooms_unauthenticated(self):
+
+    def test_list_rooms_gzip(self, client):
+        """Large list responses are gzip-compressed only when the client accepts it"""
+        compressed = client.get("/rooms", headers={**self.headers, "Accept-Encoding": "gzip"})
+        assert compressed.headers.get("content-encoding") == "gzip"
+
+        plain = client.get("/rooms", headers={**self.headers, "Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+
+    def test_list_rooms_unauthenticated(self, client):
         """Test that listing rooms without auth fails"""
         response = client.get("/rooms")
         
         assert response.status_code == 401
     
-    def test_list_rooms_invalid_token(self):
+    def test_list_rooms_invalid_token(self, client):
         """Test listing rooms with invalid token"""
         response = client.get("/rooms", headers={"Authorization": "Bearer invalid_token"})
-        
+
         assert response.status_code == 401
 
+    def test_available_rooms_accepts_short_time_fields(self, client):
+        """Single-digit hours are accepted, matching the frontend's HH:MM check"""
+        response = client.get("/rooms/available", params={
+            "date": "2030-06-01", "start_time": "9:00", "end_time": "10:30"
+        }, headers=self.headers)
+
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    @pytest.mark.parametrize("params", [
+        {"date": "2030/06/01", "start_time": "09:00", "end_time": "10:00"},
+        {"date": "30-06-01", "start_time": "09:00", "end_time": "10:00"},
+        {"date": "2030-06-01", "start_time": "9am", "end_time": "10:00"},
+        {"date": "2030-06-01", "start_time": "09:00", "end_time": "25:00"},
+    ])
+    def test_available_rooms_invalid_format(self, client, params):
+        """Malformed dates and times are rejected with 400"""
+        response = client.get("/rooms/available", params=params, headers=self.headers)
+        assert response.status_code == 400
+
 
 class TestBookingsEndpoints:
     """Test booking-related endpoints"""
     
-    def setup_method(self):
-        """Get auth token"""
-        response = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
-        self.token = response.json()["token"]
-        self.headers = {"Authorization": f"Bearer {self.token}"}
-        
-        # Create a fresh attendee for public booking tests
-        import uuid
-        new_email = f"public_attendee_{uuid.uuid4().hex[:6]}@test.com"
-        reg = client.post("/auth/register", json={
-            "name": "Public Attendee",
-            "email": new_email,
-            "password": "attendeepass123",
-            "role": "attendee"
-        })
-        self.public_headers = {"Authorization": f"Bearer {reg.json()['token']}"} if reg.status_code == 201 else self.headers
+    @pytest.fixture(autouse=True)
+    def _headers(self, auth_headers, public_attendee_headers):
+        """Organiser headers plus an attendee for public booking tests"""
+        self.headers = auth_headers
+        self.public_headers = public_attendee_headers
     
-    def test_get_bookings(self):
+    def test_get_bookings(self, client):
         """Test getting user bookings"""
         response = client.get("/bookings/upcoming", headers=self.headers)
         
         assert response.status_code == 200
         bookings = response.json()
         assert isinstance(bookings, list)
-    
-    def test_public_bookings_and_register(self):
+
+    def test_get_bookings_returns_full_objects(self, client):
+        """Upcoming bookings decode to complete booking objects"""
+        booking_resp = client.post("/bookings", json={
+            "room_id": 9,
+            "title": "Listed Booking",
+            "date": "2030-05-01",
+            "start_time": "09:00",
+            "end_time": "10:00",
+        }, headers=self.headers)
+        assert booking_resp.status_code == 201
+        booking_id = booking_resp.json()["id"]
+
+        response = client.get("/bookings/upcoming", headers=self.headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        by_id = {b["id"]: b for b in response.json()}
+        assert by_id[booking_id] == booking_resp.json()
+
+    def test_create_booking_rejects_too_many_attendees(self, client):
+        """More than 50 invitees is a validation error"""
+        response = client.post("/bookings", json={
+            "room_id": 9,
+            "title": "Crowded Booking",
+            "date": "2030-05-01",
+            "start_time": "09:00",
+            "end_time": "10:00",
+            "attendee_emails": [f"guest{i}@test.com" for i in range(51)],
+        }, headers=self.headers)
+        assert response.status_code == 422
+
+    def test_public_bookings_and_register(self, client):
         """Attendee should see open meetings and be able to register"""
         public_resp = client.get("/bookings/public", headers=self.public_headers)
         assert public_resp.status_code == 200
@@ -238,20 +292,18 @@ class TestBookingsEndpoints:
             assert join_resp.status_code == 200
             assert "registered" in join_resp.json().get("message", "").lower()
     
-    def test_create_booking_missing_fields(self):
+    @pytest.mark.parametrize("booking_data", [
+        {},
+        {"room_id": 1},  # Missing other fields
+        {"title": "Test"},  # Missing room_id
+    ])
+    def test_create_booking_missing_fields(self, client, booking_data):
         """Test creating booking with missing fields"""
-        invalid_bookings = [
-            {},
-            {"room_id": 1},  # Missing other fields
-            {"title": "Test"},  # Missing room_id
-        ]
-        
-        for booking_data in invalid_bookings:
-            response = client.post("/bookings", json=booking_data, headers=self.headers)
-            # Should reject with validation error
-            assert response.status_code in [400, 422]
+        response = client.post("/bookings", json=booking_data, headers=self.headers)
+        # Should reject with validation error
+        assert response.status_code in VALIDATION_ERROR
     
-    def test_create_booking_invalid_room(self):
+    def test_create_booking_invalid_room(self, client):
         """Test creating booking with non-existent room"""
         response = client.post("/bookings", json={
             "id": 999,
@@ -264,15 +316,15 @@ class TestBookingsEndpoints:
         }, headers=self.headers)
         
         # Should handle gracefully (422 = validation error, which is correct!)
-        assert response.status_code in [201, 400, 404, 422]
+        assert response.status_code in CREATED_REJECTED_OR_NOT_FOUND
     
-    def test_get_bookings_unauthenticated(self):
+    def test_get_bookings_unauthenticated(self, client):
         """Test that unauthenticated access is rejected"""
         response = client.get("/bookings/upcoming")
         
         assert response.status_code == 401
 
-    def test_update_booking_sanitization_and_validation(self):
+    def test_update_booking_sanitization_and_validation(self, client):
         """Whitespace/overlong titles rejected; valid values are trimmed on update."""
         booking_resp = client.post(
             "/bookings",
@@ -289,79 +341,58 @@ class TestBookingsEndpoints:
         assert booking_resp.status_code == 201
         booking_id = booking_resp.json()["id"]
 
-        try:
-            resp = client.put(
-                f"/bookings/{booking_id}",
-                json={
-                    "room_id": 5,
-                    "title": "    ",
-                    "date": "2026-01-10",
-                    "start_time": "10:00",
-                    "end_time": "11:00",
-                    "notes": "Still fine",
-                },
-                headers=self.headers,
-            )
-            assert resp.status_code == 400
-
-            long_title = "A" * 201
-            resp = client.put(
-                f"/bookings/{booking_id}",
-                json={
-                    "room_id": 5,
-                    "title": long_title,
-                    "date": "2026-01-10",
-                    "start_time": "10:00",
-                    "end_time": "11:00",
-                    "notes": "Still fine",
-                },
-                headers=self.headers,
-            )
-            assert resp.status_code in (400, 422)
-
-            resp = client.put(
-                f"/bookings/{booking_id}",
-                json={
-                    "room_id": 5,
-                    "title": "   Trimmed Title   ",
-                    "date": "2026-01-10",
-                    "start_time": "10:00",
-                    "end_time": "11:00",
-                    "notes": "   spaced notes   ",
-                },
-                headers=self.headers,
-            )
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["title"] == "Trimmed Title"
-            assert data["notes"] == "spaced notes"
-        finally:
-            client.delete(f"/bookings/{booking_id}", headers=self.headers)
+        resp = client.put(
+            f"/bookings/{booking_id}",
+            json={
+                "room_id": 5,
+                "title": "    ",
+                "date": "2026-01-10",
+                "start_time": "10:00",
+                "end_time": "11:00",
+                "notes": "Still fine",
+            },
+            headers=self.headers,
+        )
+        assert resp.status_code == 400
 
-    def test_register_blocked_when_pending_fills_capacity(self):
+        long_title = "A" * 201
+        resp = client.put(
+            f"/bookings/{booking_id}",
+            json={
+                "room_id": 5,
+                "title": long_title,
+                "date": "2026-01-10",
+                "start_time": "10:00",
+                "end_time": "11:00",
+                "notes": "Still fine",
+            },
+            headers=self.headers,
+        )
+        assert resp.status_code in VALIDATION_ERROR
+
+        resp = client.put(
+            f"/bookings/{booking_id}",
+            json={
+                "room_id": 5,
+                "title": "   Trimmed Title   ",
+                "date": "2026-01-10",
+                "start_time": "10:00",
+                "end_time": "11:00",
+                "notes": "   spaced notes   ",
+            },
+            headers=self.headers,
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["title"] == "Trimmed Title"
+        assert data["notes"] == "spaced notes"
+
+    def test_register_blocked_when_pending_fills_capacity(self, client, unique_email, register_attendee, seed_attendee):
         """Self-registration should fail if pending invites already fill the room."""
         pending_emails = ["benlee@st-andrews.ac.uk"]
-        import uuid
-        for _ in range(2):
-            email = f"pending_{uuid.uuid4().hex[:6]}@test.com"
-            reg_resp = client.post("/auth/register", json={
-                "name": "Pending User",
-                "email": email,
-                "password": "password123",
-                "role": "attendee"
-            })
-            assert reg_resp.status_code == 201
-            pending_emails.append(email)
-
-        joiner_email = f"joiner_{uuid.uuid4().hex[:6]}@test.com"
-        joiner_reg = client.post("/auth/register", json={
-            "name": "Joiner User",
-            "email": joiner_email,
-            "password": "password123",
-            "role": "attendee"
-        })
-        assert joiner_reg.status_code == 201
-        joiner_headers = {"Authorization": f"Bearer {joiner_reg.json()['token']}"}
+        pending_emails += [seed_attendee(unique_email("pending")).email for _ in range(2)]
+
+        joiner_headers = register_attendee("joiner")
 
         booking_resp = client.post(
             "/bookings",
@@ -378,72 +409,115 @@ class TestBookingsEndpoints:
         assert booking_resp.status_code == 201
         booking_id = booking_resp.json()["id"]
 
-        try:
-            resp = client.post(f"/bookings/{booking_id}/register", headers=joiner_headers)
-            assert resp.status_code == 400
-            assert "full capacity" in resp.json()["detail"].lower()
-        finally:
-            client.delete(f"/bookings/{booking_id}", headers=self.headers)
+        resp = client.post(f"/bookings/{booking_id}/register", headers=joiner_headers)
+        assert resp.status_code == 400
+        assert "full capacity" in resp.json()["detail"].lower()
+
+    def test_create_booking_attendee_emails_resolved(self, client):
+        """Unknown attendee emails are rejected; duplicates collapse to one invite"""
+        booking = {
+            "room_id": 11,
+            "title": "Attendee Resolution",
+            "date": "2030-07-02",
+            "start_time": "09:00",
+            "end_time": "10:00",
+            "attendee_emails": ["benlee@st-andrews.ac.uk", "nobody@test.com"],
+        }
+        resp = client.post("/bookings", json=booking, headers=self.headers)
+        assert resp.status_code == 400
+        assert "nobody@test.com" in resp.json()["detail"]
+
+        booking["attendee_emails"] = ["benlee@st-andrews.ac.uk", "benlee@st-andrews.ac.uk"]
+        resp = client.post("/bookings", json=booking, headers=self.headers)
+        assert resp.status_code == 201
+        booking_id = resp.json()["id"]
+        stored = next(b for b in BOOKINGS if b.id == booking_id)
+        assert stored.pending_attendee_ids == [2]
+
+    def test_update_booking_keeps_accepted_and_invites_new(self, client, ben_headers):
+        """Accepted attendees stay accepted on update; newly listed ones become pending."""
+        booking = {
+            "room_id": 10,
+            "title": "Attendee Update",
+            "date": "2030-07-01",
+            "start_time": "09:00",
+            "end_time": "10:00",
+            "attendee_emails": ["benlee@st-andrews.ac.uk"],
+        }
+        booking_resp = client.post("/bookings", json=booking, headers=self.headers)
+        assert booking_resp.status_code == 201
+        booking_id = booking_resp.json()["id"]
 
-    def test_update_booking_overlap_returns_conflict(self):
-        """Updating a booking into a conflicting slot should return 409."""
-        booking1 = client.post(
+        assert client.post(f"/bookings/{booking_id}/accept", headers=ben_headers).status_code == 200
+
+        booking["attendee_emails"] = ["benlee@st-andrews.ac.uk", "chloesmith@st-andrews.ac.uk"]
+        resp = client.put(f"/bookings/{booking_id}", json=booking, headers=self.headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["attendee_emails"] == ["benlee@st-andrews.ac.uk"]
+        assert data["current_attendees"] == 2  # organiser + Ben; Chloe is pending
+
+        stored = next(b for b in BOOKINGS if b.id == booking_id)
+        assert stored.pending_attendee_ids == [3]
+
+    def test_deleted_booking_no_longer_found(self, client):
+        """A booking is reachable by id until it is deleted, then 404s."""
+        resp = client.post(
             "/bookings",
             json={
-                "room_id": 6,
-                "title": "Slot 1",
-                "date": "2026-03-01",
+                "room_id": 8,
+                "title": "Short Lived",
+                "date": "2030-04-01",
                 "start_time": "09:00",
                 "end_time": "10:00",
             },
             headers=self.headers,
         )
-        booking2 = client.post(
-            "/bookings",
+        assert resp.status_code == 201
+        booking_id = resp.json()["id"]
+        assert client.get(f"/bookings/{booking_id}", headers=self.headers).status_code == 200
+
+        assert client.delete(f"/bookings/{booking_id}", headers=self.headers).status_code == 204
+        assert client.get(f"/bookings/{booking_id}", headers=self.headers).status_code == 404
+        assert client.delete(f"/bookings/{booking_id}", headers=self.headers).status_code == 404
+
+    def test_update_booking_overlap_returns_conflict(self, client, make_booking):
+        """Updating a booking into a conflicting slot should return 409."""
+        make_booking(
+            room_id=6,
+            title="Slot 1",
+            start_time=datetime(2030, 3, 1, 9, 0),
+            end_time=datetime(2030, 3, 1, 10, 0),
+        )
+        id2 = make_booking(
+            room_id=6,
+            title="Slot 2",
+            start_time=datetime(2030, 3, 1, 11, 0),
+            end_time=datetime(2030, 3, 1, 12, 0),
+        )
+
+        resp = client.put(
+            f"/bookings/{id2}",
             json={
                 "room_id": 6,
-                "title": "Slot 2",
-                "date": "2026-03-01",
-                "start_time": "11:00",
-                "end_time": "12:00",
+                "title": "Slot 2 moved",
+                "date": "2030-03-01",
+                "start_time": "09:30",
+                "end_time": "10:30",
             },
             headers=self.headers,
         )
-        if booking1.status_code != 201 or booking2.status_code != 201:
-            pytest.skip("Could not create setup bookings")
-
-        id1 = booking1.json()["id"]
-        id2 = booking2.json()["id"]
-
-        try:
-            resp = client.put(
-                f"/bookings/{id2}",
-                json={
-                    "room_id": 6,
-                    "title": "Slot 2 moved",
-                    "date": "2026-03-01",
-                    "start_time": "09:30",
-                    "end_time": "10:30",
-                },
-                headers=self.headers,
-            )
-            assert resp.status_code == 409
-        finally:
-            client.delete(f"/bookings/{id1}", headers=self.headers)
-            client.delete(f"/bookings/{id2}", headers=self.headers)
+        assert resp.status_code == 409
 
 
 class TestNotificationsFlow:
     """Notification lifecycle and reminders."""
 
-    def setup_method(self):
-        response = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
-        self.headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    @pytest.fixture(autouse=True)
+    def _headers(self, auth_headers):
+        self.headers = auth_headers
 
-    def test_notification_mark_read_and_delete(self):
+    def test_notification_mark_read_and_delete(self, client):
         notif = create_notification(
             user_id=1,
             notif_type="booking_updated",
@@ -451,115 +525,92 @@ class TestNotificationsFlow:
             message="Please ignore",
             booking_id=None,
         )
-        initial_count = len(NOTIFICATIONS)
-        try:
-            resp = client.get("/notifications", headers=self.headers)
+        read_resp = client.put(f"/notifications/{notif.id}/read", headers=self.headers)
+        assert read_resp.status_code == 200
+
+        resp = client.get("/notifications", headers=self.headers)
+        notif_entry = next(n for n in resp.json() if n["id"] == notif.id)
+        assert notif_entry["is_read"] is True
+
+        del_resp = client.delete(f"/notifications/{notif.id}", headers=self.headers)
+        assert del_resp.status_code == 204
+
+        resp = client.get("/notifications", headers=self.headers)
+        assert notif.id not in {n["id"] for n in resp.json()}
+
+    def test_notifications_returned_newest_first(self, client):
+        """Notifications come back most recent first and only for the caller"""
+        older = create_notification(1, "booking_updated", "Older", "Please ignore")
+        newer = create_notification(1, "booking_updated", "Newer", "Please ignore")
+        other = create_notification(2, "booking_updated", "Not Alice's", "Please ignore")
+        resp = client.get("/notifications", headers=self.headers)
+        assert resp.status_code == 200
+        position = {n["id"]: i for i, n in enumerate(resp.json())}
+        assert position[newer.id] < position[older.id]
+        assert other.id not in position
+
+    def test_unread_count_tracks_create_read_and_delete(self, client):
+        """Unread count follows notification create, mark-read and delete"""
+        def unread():
+            resp = client.get("/notifications/unread/count", headers=self.headers)
             assert resp.status_code == 200
-            ids = [n["id"] for n in resp.json()]
-            assert notif.id in ids
-
-            read_resp = client.put(f"/notifications/{notif.id}/read", headers=self.headers)
-            assert read_resp.status_code == 200
-
-            resp = client.get("/notifications", headers=self.headers)
-            notif_entry = next(n for n in resp.json() if n["id"] == notif.id)
-            assert notif_entry["is_read"] is True
-
-            del_resp = client.delete(f"/notifications/{notif.id}", headers=self.headers)
-            assert del_resp.status_code == 204
-
-            resp = client.get("/notifications", headers=self.headers)
-            ids = [n["id"] for n in resp.json()]
-            assert notif.id not in ids
-        finally:
-            while len(NOTIFICATIONS) > initial_count:
-                NOTIFICATIONS.pop()
-
-    def test_booking_reminder_creates_notifications(self, monkeypatch):
-        fixed_now = datetime(2026, 4, 1, 12, 0, 0)
-
-        class FixedDateTime(datetime):
-            @classmethod
-            def utcnow(cls):
-                return fixed_now
-
-        monkeypatch.setattr("app.routes.datetime", FixedDateTime)
-
-        start = fixed_now + timedelta(hours=1)
-        end = start + timedelta(hours=1)
-        booking_id = max((b.id for b in BOOKINGS), default=0) + 1000
-        reminder_booking = Booking(
-            id=booking_id,
-            room_id=1,
-            organiser_id=1,
-            attendee_ids=[2],
-            pending_attendee_ids=[],
-            title="Reminder Test",
-            notes=None,
-            start_time=start,
-            end_time=end,
-            status="confirmed",
-            reminder_sent=False,
-        )
-        BOOKINGS.append(reminder_booking)
+            return resp.json()["count"]
+
+        baseline = unread()
+        first = create_notification(1, "booking_updated", "Unread 1", "Please ignore")
+        second = create_notification(1, "booking_updated", "Unread 2", "Please ignore")
+        assert unread() == baseline + 2
+
+        client.put(f"/notifications/{first.id}/read", headers=self.headers)
+        client.put(f"/notifications/{first.id}/read", headers=self.headers)  # repeat is a no-op
+        assert unread() == baseline + 1
+
+        client.delete(f"/notifications/{second.id}", headers=self.headers)
+        client.delete(f"/notifications/{first.id}", headers=self.headers)  # already read
+        assert unread() == baseline
+
+    def test_notification_ids_not_reused_after_delete(self, client):
+        """Deleting the newest notification must not free its id for reuse."""
+        first = create_notification(1, "booking_updated", "First", "Please ignore")
+        del_resp = client.delete(f"/notifications/{first.id}", headers=self.headers)
+        assert del_resp.status_code == 204
 
+        second = create_notification(1, "booking_updated", "Second", "Please ignore")
+        assert second.id > first.id
+
+    def test_booking_reminder_creates_notifications(self, reminder_booking):
         initial_notif_count = len(NOTIFICATIONS)
-        try:
-            process_booking_reminders()
-            assert len(NOTIFICATIONS) == initial_notif_count + 2  # organiser + attendee
-            assert reminder_booking.reminder_sent is True
-        finally:
-            BOOKINGS.remove(reminder_booking)
-            while len(NOTIFICATIONS) > initial_notif_count:
-                NOTIFICATIONS.pop()
+        process_booking_reminders()
+        assert len(NOTIFICATIONS) == initial_notif_count + 2  # organiser + attendee
+        assert reminder_booking.reminder_sent is True
+        messages = {n.user_id: n.message for n in NOTIFICATIONS[initial_notif_count:]}
+        assert messages[1] == "Your meeting 'Reminder Test' in Study Room 101 starts at 13:00 (in 1 hour)."
+        assert messages[2] == "Meeting 'Reminder Test' in Study Room 101 starts at 13:00 (in 1 hour)."
 
 
 class TestMaliciousInput:
     """Test server robustness against various attacks"""
     
-    def test_extremely_long_strings(self):
-        """Test handling of extremely long input strings"""
-        long_string = "A" * 1000  # Reduced to reasonable length
-        
-        response = client.post("/auth/register", json={
-            "name": long_string,
-            "email": f"longtest@test.com",  # Keep email reasonable
-            "password": long_string,
-            "role": "attendee"
-        })
-        
-        # Should not crash - either accept or reject gracefully
-        assert response.status_code in [201, 400, 422]
-    
-    def test_special_characters(self):
-        """Test handling of special characters"""
-        special_chars = "!@#$%^&*()_+-=[]{}|;:',.<>?/~`"
-        
-        response = client.post("/auth/register", json={
-            "name": special_chars,
-            "email": "special@test.com",
-            "password": special_chars,
-            "role": "attendee"
-        })
-        
-        # Should handle gracefully
-        assert response.status_code in [201, 400, 422]
-    
-    def test_unicode_characters(self):
-        """Test handling of Unicode characters"""
-        unicode_text = "测试用户 🚀 Тест"
-        
+    @pytest.mark.parametrize("name, email, password", [
+        # Extremely long input strings (email kept reasonable)
+        ("A" * 1000, "longtest@test.com", "A" * 1000),
+        # Special characters
+        ("!@#$%^&*()_+-=[]{}|;:',.<>?/~`", "special@test.com", "!@#$%^&*()_+-=[]{}|;:',.<>?/~`"),
+        # Unicode characters
+        ("测试用户 🚀 Тест", "unicode@test.com", "password"),
+    ], ids=["long_strings", "special_characters", "unicode_characters"])
+    def test_register_unusual_input(self, client, name, email, password):
+        """Test registration with unusual input - accept or reject gracefully, never crash"""
         response = client.post("/auth/register", json={
-            "name": unicode_text,
-            "email": "unicode@test.com",
-            "password": "password",
+            "name": name,
+            "email": email,
+            "password": password,
             "role": "attendee"
         })
         
-        # Should handle gracefully
-        assert response.status_code in [201, 400, 422]
+        assert response.status_code in CREATED_OR_REJECTED
     
-    def test_null_bytes(self):
+    def test_null_bytes(self, client):
         """Test handling of null bytes"""
         response = client.post("/auth/login", json={
             "email": "test\x00@test.com",
@@ -567,4 +618,4 @@ class TestMaliciousInput:
         })
         
         # Should not crash
-        assert response.status_code in [401, 422]
+        assert response.status_code in UNAUTHORIZED_OR_INVALID
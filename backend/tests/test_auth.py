@@ -2,6 +2,7 @@
 Unit tests for authentication functions
 """
 import pytest
+from app import auth
 from app.auth import hash_password, verify_password, create_access_token, verify_token
 
 
@@ -41,6 +42,15 @@ class TestPasswordHashing:
         assert verify_password(password, password_hash) is True
         assert verify_password("not_empty", password_hash) is False
 
+    def test_hash_uses_configured_rounds(self, monkeypatch):
+        """New hashes use BCRYPT_ROUNDS; older hashes still verify"""
+        old_hash = hash_password("rounds_password")
+        monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 5)
+        password_hash = hash_password("rounds_password")
+
+        assert password_hash.startswith("$2b$05$")
+        assert verify_password("rounds_password", old_hash) is True
+
 
 class TestJWTTokens:
     """Test JWT token creation and verification"""
@@ -56,17 +66,13 @@ class TestJWTTokens:
         assert len(token) > 0
         assert isinstance(token, str)
     
-    def test_verify_valid_token(self):
+    def test_verify_valid_token(self, sample_token):
         """Test verifying a valid token"""
-        user_id = 42
-        email = "user@test.com"
-        
-        token = create_access_token(user_id, email)
-        token_data = verify_token(token)
+        token_data = verify_token(sample_token)
         
         assert token_data is not None
-        assert token_data.user_id == user_id
-        assert token_data.email == email
+        assert token_data.user_id == 42
+        assert token_data.email == "user@test.com"
     
     def test_verify_invalid_token(self):
         """Test that invalid token returns None"""
@@ -76,16 +82,13 @@ class TestJWTTokens:
         
         assert token_data is None
     
-    def test_verify_malformed_token(self):
+    @pytest.mark.parametrize("token", [
+        pytest.param("", id="empty"),
+        pytest.param("malformed", id="no_dots"),
+        pytest.param("too.short", id="two_segments"),
+        pytest.param("eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.invalid.signature", id="bad_signature"),
+    ])
+    def test_verify_malformed_token(self, token):
         """Test handling of malformed tokens"""
-        malformed_tokens = [
-            "",
-            "malformed",
-            "too.short",
-            "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.invalid.signature"
-        ]
-        
-        for token in malformed_tokens:
-            result = verify_token(token)
-            assert result is None, f"Token {token} should return None"
+        assert verify_token(token) is None, f"Token {token} should return None"
 
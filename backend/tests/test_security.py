@@ -13,236 +13,214 @@ Tests the server's robustness against:
 These tests prove the server does NOT crash under malicious input.
 """
 import pytest
-from fastapi.testclient import TestClient
-from app import app
+from hypothesis import HealthCheck, example, given, settings, strategies as st
 
-client = TestClient(app)
+from app.middleware import MAX_BODY_BYTES
+
+# Acceptable status codes for "handled gracefully" assertions
+VALIDATION_ERROR = frozenset({400, 422})
+UNAUTHORIZED_OR_INVALID = frozenset({401, 422})
+CREATED_OR_REJECTED = frozenset({201, 400, 422})
+CREATED_REJECTED_OR_CONFLICT = frozenset({201, 400, 409, 422})
+REJECTED_OR_UNAUTHORIZED = frozenset({400, 401, 422})
+REJECTED_OR_UNSUPPORTED = frozenset({400, 415, 422})
+
+# Attack payloads, one test node each; the ids name the payload in reports
+SQLI_LOGIN_PAYLOADS = (
+    pytest.param("'; DROP TABLE users; --", id="drop_table"),
+    pytest.param("admin' OR '1'='1", id="or_true"),
+    pytest.param("' OR '1'='1' --", id="or_true_comment"),
+    pytest.param("'; DELETE FROM bookings; --", id="delete"),
+    pytest.param("1; SELECT * FROM users", id="stacked_select"),
+)
+SQLI_REGISTRATION_PAYLOADS = (
+    pytest.param("'; DROP TABLE users; --", id="drop_table"),
+    pytest.param("admin'--", id="comment"),
+    pytest.param("1' OR '1'='1", id="or_true"),
+)
+XSS_NAME_PAYLOADS = (
+    pytest.param("<script>alert('xss')</script>", id="script_tag"),
+    pytest.param("<img src=x onerror=alert('xss')>", id="img_onerror"),
+    pytest.param("javascript:alert('xss')", id="javascript_uri"),
+    pytest.param("<svg onload=alert('xss')>", id="svg_onload"),
+    pytest.param("'><script>alert(document.cookie)</script>", id="attr_breakout"),
+)
+XSS_TITLE_PAYLOADS = (
+    pytest.param("<script>alert('xss')</script>", id="script_tag"),
+    pytest.param("Meeting<img src=x onerror=alert(1)>", id="img_onerror"),
+)
+PATH_TRAVERSAL_PAYLOADS = (
+    pytest.param("../../etc/passwd", id="unix"),
+    pytest.param("..\\..\\windows\\system32", id="windows"),
+    pytest.param("....//....//etc/passwd", id="doubled_dots"),
+    pytest.param("%2e%2e%2f%2e%2e%2fetc/passwd", id="url_encoded"),
+)
+UNICODE_NAMES = (
+    pytest.param("测试用户", id="chinese"),
+    pytest.param("Тестовый пользователь", id="russian"),
+    pytest.param("المستخدم التجريبي", id="arabic_rtl"),
+    pytest.param("Rocket User", id="no_emoji"),  # Emojis may fail validation
+    pytest.param("Zero Width", id="zero_width"),  # Zero-width space removed
+    pytest.param("Café User", id="accented"),
+)
+INVALID_TOKENS = (
+    pytest.param("not_a_token", id="no_scheme"),
+    pytest.param("Bearer ", id="bearer_blank"),
+    pytest.param("Bearer", id="bearer_only"),
+    pytest.param("Bearer invalid.token.here", id="bearer_garbage"),
+    pytest.param("Basic dXNlcjpwYXNz", id="basic_auth"),
+)
 
 
 class TestSQLInjection:
     """Test SQL injection protection"""
     
-    @pytest.fixture(autouse=True)
-    def setup(self):
-        """Get auth token for tests"""
-        response = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
-        if response.status_code == 200:
-            self.token = response.json()["token"]
-            self.headers = {"Authorization": f"Bearer {self.token}"}
-        else:
-            self.token = None
-            self.headers = {}
-    
-    def test_sql_injection_in_login_email(self):
+    @pytest.mark.parametrize("payload", SQLI_LOGIN_PAYLOADS)
+    async def test_sql_injection_in_login_email(self, aclient, payload):
         """Test SQL injection in login email field"""
-        payloads = [
-            "'; DROP TABLE users; --",
-            "admin' OR '1'='1",
-            "' OR '1'='1' --",
-            "'; DELETE FROM bookings; --",
-            "1; SELECT * FROM users",
-        ]
-        
-        for payload in payloads:
-            response = client.post("/auth/login", json={
-                "email": payload,
-                "password": "password"
-            })
-            # Should not crash - returns auth error
-            assert response.status_code in [400, 401, 422]
+        response = await aclient.post("/auth/login", json={
+            "email": payload,
+            "password": "password"
+        })
+        # Should not crash - returns auth error
+        assert response.status_code in REJECTED_OR_UNAUTHORIZED
     
-    def test_sql_injection_in_registration(self):
+    @pytest.mark.parametrize("payload", SQLI_REGISTRATION_PAYLOADS)
+    async def test_sql_injection_in_registration(self, aclient, unique_email, payload):
         """Test SQL injection in registration fields"""
-        import uuid
-        payloads = [
-            "'; DROP TABLE users; --",
-            "admin'--",
-            "1' OR '1'='1",
-        ]
-        
-        for i, payload in enumerate(payloads):
-            unique_id = uuid.uuid4().hex[:8]
-            response = client.post("/auth/register", json={
-                "name": payload if len(payload) >= 2 else "AB",  # Name must be 2+ chars
-                "email": f"sqli{unique_id}@test.com",
-                "password": "password12345",  # At least 8 chars
-                "role": "attendee"
-            })
-            # Should handle gracefully (reject or accept safely)
-            assert response.status_code in [201, 400, 422]
+        response = await aclient.post("/auth/register", json={
+            "name": payload,
+            "email": unique_email("sqli"),
+            "password": "password12345",  # At least 8 chars
+            "role": "attendee"
+        })
+        # Should handle gracefully (reject or accept safely)
+        assert response.status_code in CREATED_OR_REJECTED
 
 
 class TestXSSPrevention:
     """Test XSS attack prevention"""
     
-    def test_xss_in_registration_name(self):
+    @pytest.mark.parametrize("payload", XSS_NAME_PAYLOADS)
+    async def test_xss_in_registration_name(self, aclient, unique_email, payload):
         """Test XSS payloads in user name"""
-        import uuid
-        payloads = [
-            "<script>alert('xss')</script>",
-            "<img src=x onerror=alert('xss')>",
-            "javascript:alert('xss')",
-            "<svg onload=alert('xss')>",
-            "'><script>alert(document.cookie)</script>",
-        ]
-        
-        for i, payload in enumerate(payloads):
-            unique_id = uuid.uuid4().hex[:8]
-            response = client.post("/auth/register", json={
-                "name": payload,
-                "email": f"xss{unique_id}@test.com",
-                "password": "password12345",  # At least 8 chars
-                "role": "attendee"
-            })
-            # Should not crash
-            assert response.status_code in [201, 400, 422]
+        response = await aclient.post("/auth/register", json={
+            "name": payload,
+            "email": unique_email("xss"),
+            "password": "password12345",  # At least 8 chars
+            "role": "attendee"
+        })
+        # Should not crash
+        assert response.status_code in CREATED_OR_REJECTED
     
-    def test_xss_in_booking_title(self):
+    @pytest.mark.parametrize("payload", XSS_TITLE_PAYLOADS)
+    async def test_xss_in_booking_title(self, aclient, auth_headers, payload):
         """Test XSS payloads in booking title"""
-        # First login
-        login_resp = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
-        
-        if login_resp.status_code != 200:
-            pytest.skip("Could not login for test")
-        
-        headers = {"Authorization": f"Bearer {login_resp.json()['token']}"}
-        
-        payloads = [
-            "<script>alert('xss')</script>",
-            "Meeting<img src=x onerror=alert(1)>",
-        ]
-        
-        for payload in payloads:
-            response = client.post("/bookings", json={
-                "room_id": 1,
-                "title": payload,
-                "date": "2025-12-01",
-                "start_time": "09:00",
-                "end_time": "10:00"
-            }, headers=headers)
-            # Should handle gracefully (409 = conflict if room already booked)
-            assert response.status_code in [201, 400, 409, 422]
+        response = await aclient.post("/bookings", json={
+            "room_id": 1,
+            "title": payload,
+            "date": "2025-12-01",
+            "start_time": "09:00",
+            "end_time": "10:00"
+        }, headers=auth_headers)
+        # Should handle gracefully (409 = conflict if room already booked)
+        assert response.status_code in CREATED_REJECTED_OR_CONFLICT
 
 
 class TestPathTraversal:
     """Test path traversal attack prevention"""
     
-    def test_path_traversal_in_email(self):
+    @pytest.mark.parametrize("payload", PATH_TRAVERSAL_PAYLOADS)
+    async def test_path_traversal_in_email(self, aclient, payload):
         """Test path traversal patterns in email"""
-        payloads = [
-            "../../etc/passwd",
-            "..\\..\\windows\\system32",
-            "....//....//etc/passwd",
-            "%2e%2e%2f%2e%2e%2fetc/passwd",
-        ]
-        
-        for payload in payloads:
-            response = client.post("/auth/login", json={
-                "email": payload,
-                "password": "test"
-            })
-            # Should not crash
-            assert response.status_code in [400, 401, 422]
+        response = await aclient.post("/auth/login", json={
+            "email": payload,
+            "password": "test"
+        })
+        # Should not crash
+        assert response.status_code in REJECTED_OR_UNAUTHORIZED
 
 
 class TestBufferOverflow:
     """Test buffer overflow protection (extremely long inputs)"""
     
-    def test_extremely_long_email(self):
-        """Test very long email address"""
-        long_email = "a" * 10000 + "@test.com"
-        response = client.post("/auth/register", json={
+    @pytest.mark.parametrize("length", [256, 1000, 10000])
+    @pytest.mark.parametrize("field", ["name", "email", "password"])
+    async def test_field_rejects_over_limit(self, aclient, unique_email, field, length):
+        """Test very long name, email and password (all beyond every limit)"""
+        body = {
             "name": "Test",
-            "email": long_email,
-            "password": "password123",
+            "email": unique_email("longfield"),
+            "password": "password12345",  # At least 8 chars
             "role": "attendee"
-        })
+        }
+        body[field] = "a" * length + "@test.com" if field == "email" else "A" * length
+        response = await aclient.post("/auth/register", json=body)
         # Should reject gracefully, not crash
-        assert response.status_code in [400, 422]
+        assert response.status_code in VALIDATION_ERROR
     
-    def test_extremely_long_password(self):
-        """Test very long password"""
-        long_password = "A" * 10000
-        response = client.post("/auth/register", json={
-            "name": "Test",
-            "email": "longpwd@test.com",
-            "password": long_password,
+    async def test_oversized_body_rejected_before_parsing(self, aclient, unique_email):
+        """Test bodies over the size limit get 413 without reaching validation"""
+        response = await aclient.post("/auth/register", json={
+            "name": "A" * (MAX_BODY_BYTES + 1),
+            "email": unique_email("huge"),
+            "password": "password12345",
             "role": "attendee"
         })
-        # Should reject gracefully
-        assert response.status_code in [400, 422]
+        assert response.status_code == 413
+        assert response.json() == {"detail": "Request body too large"}
     
-    def test_extremely_long_name(self):
-        """Test very long name"""
-        import uuid
-        long_name = "A" * 10000
-        unique_id = uuid.uuid4().hex[:8]
-        response = client.post("/auth/register", json={
-            "name": long_name,
-            "email": f"longname{unique_id}@test.com",
-            "password": "password12345",  # At least 8 chars
-            "role": "attendee"
-        })
-        # Should reject gracefully
-        assert response.status_code in [400, 422]
+    async def test_oversized_chunked_body_rejected(self, aclient):
+        """Test bodies sent without a Content-Length are counted as they arrive"""
+        async def chunks():
+            for _ in range(5):
+                yield b"A" * (MAX_BODY_BYTES // 4)
+        
+        response = await aclient.post(
+            "/auth/login",
+            content=chunks(),
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 413
 
 
 class TestUnicodeEdgeCases:
     """Test Unicode edge case handling"""
     
-    def test_unicode_in_name(self):
+    @pytest.mark.parametrize("name", UNICODE_NAMES)
+    async def test_unicode_in_name(self, aclient, unique_email, name):
         """Test various Unicode characters in name"""
-        import uuid
-        unicode_names = [
-            "测试用户",  # Chinese
-            "Тестовый пользователь",  # Russian
-            "المستخدم التجريبي",  # Arabic (RTL)
-            "Rocket User",  # No emojis (they may fail validation)
-            "Zero Width",  # Zero-width space removed
-            "Café User",  # Accented chars
-        ]
-        
-        for i, name in enumerate(unicode_names):
-            unique_id = uuid.uuid4().hex[:8]
-            response = client.post("/auth/register", json={
-                "name": name,
-                "email": f"unicode{unique_id}@test.com",
-                "password": "password12345",  # At least 8 chars
-                "role": "attendee"
-            })
-            # Should handle gracefully
-            assert response.status_code in [201, 400, 422]
-    
-    def test_null_bytes(self):
-        """Test null byte injection"""
-        response = client.post("/auth/login", json={
-            "email": "test\x00@test.com",
-            "password": "pass\x00word"
+        response = await aclient.post("/auth/register", json={
+            "name": name,
+            "email": unique_email("unicode"),
+            "password": "password12345",  # At least 8 chars
+            "role": "attendee"
         })
-        # Should not crash
-        assert response.status_code in [400, 401, 422]
+        # Should handle gracefully
+        assert response.status_code in CREATED_OR_REJECTED
     
-    def test_control_characters(self):
-        """Test control character handling"""
-        control_chars = "test\x01\x02\x03\x04@test.com"
-        response = client.post("/auth/login", json={
-            "email": control_chars,
-            "password": "password"
+    # Surrogates (category Cs) cannot be encoded as JSON request bodies
+    @given(
+        email=st.text(st.characters(exclude_categories=("Cs",)), min_size=1, max_size=100),
+        password=st.text(st.characters(exclude_categories=("Cs",)), max_size=50),
+    )
+    @example(email="test\x00@test.com", password="pass\x00word")  # Null bytes
+    @example(email="test\x01\x02\x03\x04@test.com", password="password")  # Control chars
+    @settings(max_examples=25, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    async def test_login_never_errors_on_arbitrary_text(self, aclient, email, password):
+        """Test arbitrary Unicode, null bytes and control characters in login"""
+        response = await aclient.post("/auth/login", json={
+            "email": email,
+            "password": password
         })
         # Should handle gracefully
-        assert response.status_code in [400, 401, 422]
+        assert response.status_code in REJECTED_OR_UNAUTHORIZED
 
 
 class TestMalformedJSON:
     """Test handling of malformed requests"""
     
-    def test_wrong_content_type(self):
+    def test_wrong_content_type(self, client):
         """Test request with wrong content type"""
         response = client.post(
             "/auth/login",
@@ -250,49 +228,43 @@ class TestMalformedJSON:
             headers={"Content-Type": "text/plain"}
         )
         # Should return appropriate error
-        assert response.status_code in [400, 415, 422]
+        assert response.status_code in REJECTED_OR_UNSUPPORTED
     
-    def test_empty_body(self):
+    def test_empty_body(self, client):
         """Test request with empty body"""
         response = client.post("/auth/login", json={})
         assert response.status_code == 422
+    
+    def test_invalid_json_body(self, client):
+        """Test request with a JSON content type but an unparseable body"""
+        response = client.post(
+            "/auth/login",
+            content=b'{"email": "alicejohnson@st-andrews.ac.uk", ',
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
 
 
 class TestAuthorizationBypass:
     """Test authorization bypass attempts"""
     
-    def test_invalid_token_format(self):
+    @pytest.mark.parametrize("token", INVALID_TOKENS)
+    def test_invalid_token_format(self, client, token):
         """Test invalid token formats"""
-        invalid_tokens = [
-            "not_a_token",
-            "Bearer ",
-            "Bearer",
-            "Bearer invalid.token.here",
-            "Basic dXNlcjpwYXNz",  # Basic auth
-        ]
-        
-        for token in invalid_tokens:
-            response = client.get(
-                "/rooms",
-                headers={"Authorization": token}
-            )
-            assert response.status_code in [401, 422]
+        response = client.get(
+            "/rooms",
+            headers={"Authorization": token}
+        )
+        assert response.status_code in UNAUTHORIZED_OR_INVALID
     
-    def test_tampered_token(self):
+    def test_tampered_token(self, client, alice_token):
         """Test tampered JWT token"""
-        # Get a valid token first
-        login_resp = client.post("/auth/login", json={
-            "email": "alicejohnson@st-andrews.ac.uk",
-            "password": "password123"
-        })
+        # Tamper with a valid token
+        tampered = alice_token[:-5] + "XXXXX"
         
-        if login_resp.status_code == 200:
-            valid_token = login_resp.json()["token"]
-            # Tamper with it
-            tampered = valid_token[:-5] + "XXXXX"
-            
-            response = client.get(
-                "/rooms",
-                headers={"Authorization": f"Bearer {tampered}"}
-            )
-            assert response.status_code == 401
+        response = client.get(
+            "/rooms",
+            headers={"Authorization": f"Bearer {tampered}"}
+        )
+        assert response.status_code == 401
@@ -0,0 +1,245 @@
+"""
+Unit tests for JSON file storage.
+
+Tests cover:
+- Snapshot save/load round trips
+- Queued (write-behind) snapshot saves and their fsyncs
+- Bookings journal replay (upserts, deletes, truncated lines, corrupt snapshots)
+- Journal compaction, inline and by the background task
+- First-run default files
+"""
+import asyncio
+import os
+from datetime import datetime
+
+from app import storage
+from app.data import Booking
+from app.storage import (
+    append_to_journal, compact_journal, flush_pending_saves, install_default_files, load_from_json, load_journaled,
+    replay_journal, save_to_json, schedule_save,
+)
+
+
+def make_booking(booking_id, title="Journal Test"):
+    return Booking(
+        id=booking_id,
+        room_id=1,
+        organiser_id=1,
+        title=title,
+        start_time=datetime(2030, 1, 1, 9, 0),
+        end_time=datetime(2030, 1, 1, 10, 0),
+    )
+
+
+class TestSnapshotFiles:
+    """Test generic snapshot save/load"""
+
+    def test_round_trip_preserves_datetimes(self, tmp_path):
+        """Datetimes are written as ISO strings and parsed back on load"""
+        path = tmp_path / "bookings.json"
+        save_to_json([make_booking(1), make_booking(2)], path)
+
+        raw = path.read_bytes()
+        assert b'"2030-01-01T09:00:00"' in raw
+        assert b"\n" not in raw
+
+        bookings = load_from_json(path, Booking)
+
+        assert [b.id for b in bookings] == [1, 2]
+        assert bookings[0].start_time == datetime(2030, 1, 1, 9, 0)
+        assert bookings[0].start_time.tzinfo is None
+
+    def test_save_empty_list(self, tmp_path):
+        """An empty collection is written as an empty JSON array"""
+        path = tmp_path / "rooms.json"
+        save_to_json([], path)
+
+        assert load_from_json(path, Booking) == []
+
+    def test_large_snapshot_stream_parsed(self, tmp_path, monkeypatch):
+        """Snapshots over the threshold load the same records via ijson"""
+        monkeypatch.setattr(storage, "STREAM_LOAD_THRESHOLD_BYTES", 0)
+        path = tmp_path / "bookings.json"
+        save_to_json([make_booking(1), make_booking(2)], path)
+
+        bookings = load_from_json(path, Booking)
+
+        assert [b.id for b in bookings] == [1, 2]
+        assert bookings[1].end_time == datetime(2030, 1, 1, 10, 0)
+
+    def test_save_leaves_no_temp_file(self, tmp_path):
+        """Snapshots are renamed into place"""
+        path = tmp_path / "bookings.json"
+        save_to_json([make_booking(1)], path)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["bookings.json"]
+
+
+class TestWriteBehind:
+    """Test queued snapshot saves"""
+
+    def test_schedule_writes_immediately_without_flusher(self, tmp_path, monkeypatch):
+        """Outside the app lifespan saves are synchronous"""
+        monkeypatch.setattr(storage, "_write_behind_active", False)
+        path = tmp_path / "bookings.json"
+        schedule_save([make_booking(1)], path)
+
+        assert path.exists()
+
+    def test_repeated_saves_collapse_into_latest(self, tmp_path, monkeypatch):
+        """Only the last queued snapshot for a file is written on flush"""
+        monkeypatch.setattr(storage, "_write_behind_active", True)
+        # Keep the session app's background flusher from draining the queue mid-test
+        monkeypatch.setattr(storage, "flush_pending_saves", lambda: None)
+        path = tmp_path / "bookings.json"
+
+        schedule_save([make_booking(1)], path)
+        schedule_save([make_booking(1), make_booking(2)], path)
+        assert not path.exists()
+
+        flush_pending_saves()
+
+        assert [b.id for b in load_from_json(path, Booking)] == [1, 2]
+
+    def test_flush_fsyncs_each_file_and_directory_once(self, tmp_path, monkeypatch):
+        """Every flushed file is fsynced before its rename; the directory once per batch"""
+        monkeypatch.setattr(storage, "_write_behind_active", True)
+        monkeypatch.setattr(storage, "flush_pending_saves", lambda: None)
+        file_syncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (file_syncs.append(fd), real_fsync(fd)))
+        dir_syncs = []
+        monkeypatch.setattr(storage, "_fsync_dir", dir_syncs.append)
+
+        schedule_save([make_booking(1)], tmp_path / "bookings.json")
+        schedule_save([make_booking(2)], tmp_path / "users.json")
+        flush_pending_saves()
+
+        assert len(file_syncs) == 2
+        assert dir_syncs == [tmp_path]
+
+
+class TestBookingsJournal:
+    """Test append-only journal replay"""
+
+    def test_replay_applies_upserts_and_deletes(self, tmp_path):
+        """Journal events are applied in order on top of the snapshot"""
+        journal = tmp_path / "bookings.jsonl"
+        snapshot = [make_booking(1), make_booking(2)]
+
+        append_to_journal({"op": "upsert", "item": make_booking(3).model_dump(mode="json")}, journal)
+        append_to_journal({"op": "upsert", "item": make_booking(1, "Renamed").model_dump(mode="json")}, journal)
+        append_to_journal({"op": "delete", "id": 2}, journal)
+
+        bookings = replay_journal(snapshot, journal, Booking)
+
+        assert [b.id for b in bookings] == [1, 3]
+        assert bookings[0].title == "Renamed"
+        assert bookings[0].start_time == datetime(2030, 1, 1, 9, 0)
+
+    def test_replay_without_journal_returns_snapshot(self, tmp_path):
+        """A missing journal leaves the snapshot untouched"""
+        snapshot = [make_booking(1)]
+        assert replay_journal(snapshot, tmp_path / "missing.jsonl", Booking) == snapshot
+
+    def test_replay_stops_at_truncated_line(self, tmp_path):
+        """A torn final write is ignored rather than failing the load"""
+        journal = tmp_path / "bookings.jsonl"
+        append_to_journal({"op": "upsert", "item": make_booking(5).model_dump(mode="json")}, journal)
+        with open(journal, "a") as f:
+            f.write('{"op": "upsert", "item": {"id": 6')
+
+        bookings = replay_journal([], journal, Booking)
+
+        assert [b.id for b in bookings] == [5]
+
+    def test_journaled_booking_with_frozen_clock_datetime(self, tmp_path, monkeypatch):
+        """Frozen-clock datetimes (a datetime subclass) still journal cleanly"""
+        class FakeDatetime(datetime):
+            pass
+
+        journal = tmp_path / "bookings.jsonl"
+        monkeypatch.setattr(storage, "BOOKINGS_JOURNAL", journal)
+        booking = make_booking(7)
+        booking.start_time = FakeDatetime(2030, 1, 1, 9, 0)
+        storage.journal_booking(booking)
+
+        bookings = replay_journal([], journal, Booking)
+
+        assert bookings[0].start_time == datetime(2030, 1, 1, 9, 0)
+
+    def test_corrupt_snapshot_set_aside_and_journal_replayed(self, tmp_path):
+        """An unreadable snapshot is kept on disk and the journal still loads"""
+        journal = tmp_path / "bookings.jsonl"
+        snapshot = tmp_path / "bookings.json"
+        snapshot.write_bytes(b'[{"id": 1, "title": ')
+        append_to_journal({"op": "upsert", "item": make_booking(4).model_dump(mode="json")}, journal)
+
+        bookings = load_journaled(snapshot, journal, Booking)
+
+        assert [b.id for b in bookings] == [4]
+        assert not snapshot.exists()
+        [aside] = tmp_path.glob("bookings.json.corrupt-*")
+        assert aside.read_bytes() == b'[{"id": 1, "title": '
+
+    def test_missing_snapshot_loads_as_first_run(self, tmp_path):
+        """No snapshot means first run, so the caller installs defaults"""
+        assert load_journaled(tmp_path / "bookings.json", tmp_path / "bookings.jsonl", Booking) is None
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        """Compaction writes the snapshot, drops the journal and restarts the count"""
+        journal = tmp_path / "bookings.jsonl"
+        snapshot = tmp_path / "bookings.json"
+
+        assert append_to_journal({"op": "delete", "id": 1}, journal) == 1
+        assert append_to_journal({"op": "delete", "id": 2}, journal) == 2
+
+        compact_journal([make_booking(3)], snapshot, journal)
+
+        assert not journal.exists()
+        assert [b.id for b in load_from_json(snapshot, Booking)] == [3]
+        assert append_to_journal({"op": "delete", "id": 4}, journal) == 1
+
+
+    async def test_threshold_compaction_left_to_background_task(self, tmp_path, monkeypatch):
+        """Past the threshold a request only flags the journal; the task compacts it"""
+        journal = tmp_path / "bookings.jsonl"
+        snapshot = tmp_path / "bookings.json"
+        monkeypatch.setattr(storage, "BOOKINGS_JOURNAL", journal)
+        monkeypatch.setattr(storage, "BOOKINGS_FILE", snapshot)
+        monkeypatch.setattr(storage, "COMPACTION_APPEND_THRESHOLD", 1)
+        monkeypatch.setattr(storage, "_compaction_active", True)
+
+        storage.journal_booking(make_booking(8))
+
+        assert journal.exists() and not snapshot.exists()
+        task = asyncio.create_task(storage.run_periodic_compaction(check_seconds=0.01))
+        for _ in range(100):
+            if snapshot.exists():
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert snapshot.exists() and not journal.exists()
+
+
+class TestDefaultFiles:
+    """Test first-run installation of the shipped default snapshots"""
+
+    def test_missing_files_copied_from_defaults(self, tmp_path, monkeypatch):
+        """Absent storage files are copied; existing ones are left alone"""
+        defaults = tmp_path / "defaults"
+        defaults.mkdir()
+        save_to_json([make_booking(1)], defaults / "bookings.json")
+        save_to_json([make_booking(2)], defaults / "users.json")
+        monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+        monkeypatch.setattr(storage, "DEFAULTS_DIR", defaults)
+        monkeypatch.setattr(storage, "BOOKINGS_FILE", tmp_path / "bookings.json")
+        monkeypatch.setattr(storage, "USERS_FILE", tmp_path / "users.json")
+        save_to_json([make_booking(3)], tmp_path / "users.json")
+
+        install_default_files()
+
+        assert [b.id for b in load_from_json(tmp_path / "bookings.json", Booking)] == [1]
+        assert [b.id for b in load_from_json(tmp_path / "users.json", Booking)] == [3]
@@ -24,40 +24,54 @@ from app.validation import (
     MAX_TITLE_LENGTH,
     MAX_NOTES_LENGTH,
     MIN_PASSWORD_LENGTH,
-    MAX_PASSWORD_LENGTH
+    MAX_PASSWORD_LENGTH,
+    _normalize_email,
 )
 
 
 class TestEmailValidation:
     """Test email validation"""
     
-    def test_valid_email(self):
+    @pytest.mark.parametrize("email", [
+        "user@example.com",
+        "test.user@domain.org",
+        "user+tag@company.co.uk",
+        "USER@EXAMPLE.COM",  # Should be lowercased
+    ])
+    def test_valid_email(self, email):
         """Test valid email addresses"""
-        valid_emails = [
-            "user@example.com",
-            "test.user@domain.org",
-            "user+tag@company.co.uk",
-            "USER@EXAMPLE.COM",  # Should be lowercased
-        ]
-        for email in valid_emails:
-            result = validate_email(email)
-            assert result == email.lower().strip()
-    
-    def test_invalid_email_format(self):
+        assert validate_email(email) == email.lower().strip()
+    
+    @pytest.mark.parametrize("email", [
+        "not_an_email",
+        "@missing_local.com",
+        "missing_domain@",
+        "spaces in@email.com",
+        "double@@at.com",
+        "no_tld@domain",
+        "unicode@dömain.com",
+    ])
+    def test_invalid_email_format(self, email):
         """Test rejection of invalid email formats"""
-        invalid_emails = [
-            "not_an_email",
-            "@missing_local.com",
-            "missing_domain@",
-            "spaces in@email.com",
-            "double@@at.com",
-            "no_tld@domain",
-        ]
-        for email in invalid_emails:
-            with pytest.raises(HTTPException) as exc_info:
-                validate_email(email)
-            assert exc_info.value.status_code == 400
-            assert "Invalid email format" in exc_info.value.detail
+        with pytest.raises(HTTPException) as exc_info:
+            validate_email(email)
+        assert exc_info.value.status_code == 400
+        assert "Invalid email format" in exc_info.value.detail
+    
+    @pytest.mark.parametrize("email", [
+        "dots@domain..com",
+        "hyphen@-domain-.com",
+        "a.b-c%d+e_f.g.h.i.j.k.l.m.n.o.p.q.r@example.com",
+    ])
+    def test_lenient_email_still_accepted(self, email):
+        """Test addresses the original pattern allowed stay valid"""
+        assert validate_email(email) == email
+    
+    def test_pathological_email_rejected_quickly(self):
+        """Test long near-miss input does not trigger regex backtracking"""
+        with pytest.raises(HTTPException) as exc_info:
+            validate_email("a@" + "a." * 120 + "-")
+        assert exc_info.value.status_code == 400
     
     def test_empty_email(self):
         """Test rejection of empty email"""
@@ -65,6 +79,13 @@ class TestEmailValidation:
             validate_email("")
         assert exc_info.value.status_code == 400
     
+    def test_repeated_invalid_email_raises_each_time(self):
+        """Test cached validation still raises on every invalid call"""
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                validate_email("double@@at.com")
+            assert exc_info.value.detail == "Invalid email format"
+    
     def test_email_too_long(self):
         """Test rejection of overly long email"""
         long_email = "a" * 250 + "@test.com"
@@ -72,6 +93,13 @@ class TestEmailValidation:
             validate_email(long_email)
         assert exc_info.value.status_code == 400
         assert "254" in exc_info.value.detail
+    
+    def test_email_too_long_skips_cache(self):
+        """Test oversized email is rejected before the cached normaliser"""
+        misses = _normalize_email.cache_info().misses
+        with pytest.raises(HTTPException):
+            validate_email("a" * 10000 + "@test.com")
+        assert _normalize_email.cache_info().misses == misses
 
 
 class TestNameValidation:
@@ -6,8 +6,17 @@ Note: This module does NOT need 'import json' because:
 - We catch ValueError which is the parent class of JSONDecodeError
 - The backend (storage.py) handles actual JSON file operations
 """
+import copy
+import threading
+import time
+
 import requests
 
+# How long a GET response is reused before asking the server again
+CACHE_TTL_SECONDS = 5.0
+# No endpoint changes the room list or a user's profile, so keep these longer
+CACHE_TTL_OVERRIDES = {"/rooms": 300.0, "/user/profile": 300.0}
+
 
 class APIClient:
     """Talk to backend API"""
@@ -16,18 +25,76 @@ class APIClient:
         self.base_url = base_url
         self.token = None
         self.headers = {}
+        # One session per thread keeps its connection to the server alive
+        # between calls; requests.Session is not safe to share across threads
+        self._local = threading.local()
+        self._cache = {}  # (endpoint, params) -> (fetched_at, response data)
+        # Bumped whenever cached data goes stale; a GET that was in flight
+        # across a bump must not put its (now outdated) result in the cache
+        self._generation = 0
+        self._cache_lock = threading.Lock()
     
     def set_token(self, token):
         """Set authentication token"""
         self.token = token
         self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        # Cached responses, and any still in flight, belong to the previous user
+        self._reset_cache()
+    
+    def _reset_cache(self):
+        """Empty the cache and disown GETs still in flight"""
+        with self._cache_lock:
+            self._generation += 1
+            self._cache.clear()
+    
+    def invalidate(self, prefix=None):
+        """Drop cached GET responses for endpoints starting with prefix (all if None)"""
+        if prefix is None:
+            self._reset_cache()
+            return
+        with self._cache_lock:
+            self._generation += 1
+            for key in list(self._cache):
+                if key[0].startswith(prefix):
+                    del self._cache[key]
     
     def make_request(self, method, endpoint, data=None, params=None):
         """Generic request helper with error handling"""
+        if method == "GET":
+            key = (endpoint, tuple(sorted(params.items())) if params else ())
+            cached = self._cache.get(key)
+            ttl = CACHE_TTL_OVERRIDES.get(endpoint, CACHE_TTL_SECONDS)
+            if cached and time.monotonic() - cached[0] < ttl:
+                # Callers may sort or filter what they get back in place
+                return copy.deepcopy(cached[1])
+            generation = self._generation
+        
+        result = self._send(method, endpoint, data, params)
+        if method == "GET":
+            with self._cache_lock:
+                if generation == self._generation:
+                    self._cache[key] = (time.monotonic(), copy.deepcopy(result))
+        else:
+            # Changes ripple across endpoints (bookings, availability,
+            # other users' notifications), so start from a clean cache;
+            # GETs issued before the change finished would be stale too
+            self._reset_cache()
+        return result
+    
+    @property
+    def session(self):
+        """This thread's requests.Session, created on first use"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
+    def _send(self, method, endpoint, data, params):
+        """Issue one request and translate failures into readable errors"""
         url = f"{self.base_url}{endpoint}"
         
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 headers=self.headers,
@@ -1,15 +1,45 @@
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from ui_components import ScrollableFrame, COLORS
 
+# Quiet period before a burst of clicks or filter changes is acted on
+DEBOUNCE_MS = 250
+# How long a toast message stays on screen
+TOAST_MS = 2000
+# How often finished background calls are checked for while any are running
+POLL_MS = 50
+
+
+def _booking_row(booking):
+    """Treeview values for one booking: title, room, date, time, attendees, status"""
+    return (
+        booking.get('title', ''),
+        booking.get('room_name', ''),
+        booking.get('date', ''),
+        f"{booking.get('start_time', '')} - {booking.get('end_time', '')}",
+        f"{booking.get('current_attendees', 0)}/{booking.get('capacity', 0)}",
+        booking.get('status', 'Confirmed')
+    )
+
 class Dashboard:
     def __init__(self, app):
         self.app = app
         self.room_data = []  # Initialize room data
+        self.all_rooms = None  # Rooms fetched for the open room browser, before filtering
         self.current_bookings = {}  # Initialize current bookings for reference
         self.unread_notification_count = 0  # Track unread notifications
         self.notification_badge = None  # Reference to notification badge label
+        # API calls run here so the window keeps responding while waiting on the server
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Finished calls wait here for the Tk thread; workers never touch Tk
+        self._results = queue.Queue()
+        self._running = 0  # Background calls not yet delivered
+        self._poll_id = None  # Pending after() id from _poll_results
+        self._debounce_id = None  # Pending after() id from _debounce
+        self._dialogs = {}  # Title -> open confirmation Toplevel, one per action
 
     def _validate_datetime_inputs(self, date: str, start_time: str, end_time: str) -> bool:
         """Shared validation for date/time fields used by create and edit flows."""
@@ -50,36 +80,98 @@ class Dashboard:
         messagebox.showerror("Organiser Only", f"{action_label} requires organiser permissions.")
         return False
 
-    def _load_available_rooms(self, date: str, start_time: str, end_time: str, listbox: tk.Listbox, store_attr: str) -> list:
-        """Fetch available rooms and populate a given listbox, storing results on the instance."""
+    def _run_in_background(self, call, on_success, on_error, owner=None):
+        """
+        Run call() on a worker thread, then on_success(result) on the Tk thread,
+        or on_error(exception) if the call raised. Both are skipped if owner
+        (the widget they would draw into) has been destroyed in the meantime,
+        e.g. because the user switched views. Errors raised by on_success are
+        left to Tk's own error reporting: the call itself succeeded.
+        """
+        future = self._executor.submit(call)
+        future.add_done_callback(lambda f: self._results.put((f, on_success, on_error, owner)))
+        self._running += 1
+        if self._poll_id is None:
+            self._poll_id = self.app.root.after(POLL_MS, self._poll_results)
+
+    def _poll_results(self):
+        """Deliver finished background calls; keeps polling while any are running"""
+        try:
+            while True:
+                try:
+                    future, on_success, on_error, owner = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._running -= 1
+                if owner is not None and not owner.winfo_exists():
+                    continue
+                error = future.exception()
+                if error is not None:
+                    on_error(error)
+                else:
+                    on_success(future.result())
+        finally:
+            # Reschedule even if a callback raised, so later results still arrive
+            self._poll_id = self.app.root.after(POLL_MS, self._poll_results) if self._running else None
+
+    def _debounce(self, delay_ms, fn):
+        """Run fn once delay_ms after the last call, dropping any call still pending"""
+        if self._debounce_id:
+            self.app.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.app.root.after(delay_ms, self._run_debounced, fn)
+
+    def _run_debounced(self, fn):
+        self._debounce_id = None
+        fn()
+
+    def _load_in_background(self, parent, fetch, render, error_message):
+        """Show a loading label in parent until fetch() returns, then render(result)"""
+        loading_label = ttk.Label(parent, text="Loading...", font=('Arial', 12))
+        loading_label.pack(pady=50)
+
+        def on_success(result):
+            loading_label.destroy()
+            render(result)
+
+        def on_error(e):
+            loading_label.destroy()
+            self._show_error_in_frame(parent, error_message)
+
+        self._run_in_background(fetch, on_success, on_error, owner=parent)
+
+    def _load_available_rooms(self, date: str, start_time: str, end_time: str, listbox: tk.Listbox, store_attr: str,
+                              on_loaded=None) -> None:
+        """Fetch available rooms and populate a given listbox, storing results on the instance.
+        on_loaded(rooms) runs once the listbox has been filled."""
         # Show loading state
         listbox.delete(0, tk.END)
         listbox.insert(tk.END, "Checking availability...")
-        listbox.update()
         
-        try:
-            # Backend expects: date (YYYY-MM-DD), start_time (HH:MM), end_time (HH:MM)
-            # Ensure time is in HH:MM format (remove seconds if present)
-            start_time_clean = start_time.split(':')[0] + ':' + start_time.split(':')[1] if ':' in start_time else start_time
-            end_time_clean = end_time.split(':')[0] + ':' + end_time.split(':')[1] if ':' in end_time else end_time
-            
-            # Ensure date is in YYYY-MM-DD format
-            date_clean = date.strip()
-            
-            rooms = self.app.api_client.get_available_rooms(date_clean, start_time_clean, end_time_clean)
+        # Backend expects: date (YYYY-MM-DD), start_time (HH:MM), end_time (HH:MM)
+        # Ensure time is in HH:MM format (remove seconds if present)
+        start_time_clean = start_time.split(':')[0] + ':' + start_time.split(':')[1] if ':' in start_time else start_time
+        end_time_clean = end_time.split(':')[0] + ':' + end_time.split(':')[1] if ':' in end_time else end_time
+        
+        # Ensure date is in YYYY-MM-DD format
+        date_clean = date.strip()
+        
+        def show_rooms(rooms):
             setattr(self, store_attr, rooms or [])
             listbox.delete(0, tk.END)
 
             if rooms and len(rooms) > 0:
+                room_infos = []
                 for room in rooms:
                     facilities = ', '.join([f.capitalize() for f in room.get('facilities', [])])
-                    room_info = f"{room['name']} | {room['capacity']} people | {room.get('building', 'N/A')} | {facilities}"
-                    listbox.insert(tk.END, room_info)
+                    room_infos.append(f"{room['name']} | {room['capacity']} people | {room.get('building', 'N/A')} | {facilities}")
+                # One insert call for the whole list rather than one Tcl round trip per room
+                listbox.insert(tk.END, *room_infos)
             else:
-                listbox.insert(tk.END, "No rooms available for selected time")
-                listbox.insert(tk.END, "Try a different date or time")
-            return rooms
-        except Exception as e:
+                listbox.insert(tk.END, "No rooms available for selected time", "Try a different date or time")
+            if on_loaded:
+                on_loaded(rooms)
+        
+        def show_error(e):
             listbox.delete(0, tk.END)
             error_msg = str(e)
             if "connect" in error_msg.lower():
@@ -88,7 +180,11 @@ class Dashboard:
             else:
                 listbox.insert(tk.END, f"Error: {error_msg[:50]}")
             messagebox.showerror("Error", f"Unable to check room availability:\n\n{str(e)}")
-            return []
+        
+        self._run_in_background(
+            lambda: self.app.api_client.get_available_rooms(date_clean, start_time_clean, end_time_clean),
+            show_rooms, show_error, owner=listbox
+        )
 
     def _validate_booking_fields(self, title: str, date: str, selected_room) -> bool:
         """Shared form validation for create/edit flows."""
@@ -105,8 +201,7 @@ class Dashboard:
     
     def update_notification_badge(self):
         """Update the notification with current unread count"""
-        try:
-            result = self.app.api_client.get_unread_notification_count()
+        def show_count(result):
             self.unread_notification_count = result.get('count', 0)
             
             if self.notification_badge:
@@ -114,9 +209,10 @@ class Dashboard:
                     self.notification_badge.config(text=f"Notifications ({self.unread_notification_count})")
                 else:
                     self.notification_badge.config(text="Notifications")
-        except Exception:
-            # Silently fail - not critical
-            pass
+        
+        # Silently fail - not critical
+        self._run_in_background(self.app.api_client.get_unread_notification_count,
+                                show_count, lambda e: None, owner=self.notification_badge)
     
     def show_dashboard(self):
         """Main dashboard"""
@@ -170,12 +266,28 @@ class Dashboard:
         
         # Show default view
         self.show_dashboard_view()
+        self.prefetch()
+    
+    def prefetch(self):
+        """
+        Fetch the profile and room list alongside the dashboard's own requests.
+        The responses land in the API client's cache, so opening those views
+        shortly afterwards needs no round trip. Failures are ignored here;
+        the view makes its own request and reports errors when opened.
+        """
+        for call in (self.app.api_client.get_user_profile, self.app.api_client.get_all_rooms):
+            self._executor.submit(call)
     
     def clear_content(self):
         """Clearing content area"""
         if hasattr(self, 'content_frame'):
             for widget in self.content_frame.winfo_children():
                 widget.destroy()
+        self.current_bookings = {}
+        # A debounced action would act on widgets that no longer exist
+        if self._debounce_id:
+            self.app.root.after_cancel(self._debounce_id)
+            self._debounce_id = None
     
     def show_dashboard_view(self):
         """Show dashboard with upcoming and past bookings"""
@@ -216,9 +328,7 @@ class Dashboard:
     
     def _show_upcoming_bookings_content(self, parent):
         """Show upcoming bookings content"""
-        try:
-            bookings = self.app.api_client.get_upcoming_bookings()
-            
+        def render(bookings):
             if not bookings:
                 no_bookings_frame = ttk.Frame(parent)
                 no_bookings_frame.pack(expand=True)
@@ -231,26 +341,24 @@ class Dashboard:
 
             # Display all bookings in a single table
             self._display_bookings_table(parent, bookings, action_type='mixed')
-            
-        except Exception as e:
-            self._show_error_in_frame(parent, "Unable to load upcoming bookings")
+        
+        self._load_in_background(parent, self.app.api_client.get_upcoming_bookings, render,
+                                 "Unable to load upcoming bookings")
     
     def _show_public_bookings_content(self, parent):
         """Show public/open bookings for self-registration"""
-        try:
-            bookings = self.app.api_client.get_public_bookings()
+        def render(bookings):
             if not bookings:
                 ttk.Label(parent, text="No open meetings available", font=('Arial', 14)).pack(expand=True, pady=40)
                 return
             self._display_bookings_table(parent, bookings, action_type='public')
-        except Exception:
-            self._show_error_in_frame(parent, "Unable to load open meetings")
+        
+        self._load_in_background(parent, self.app.api_client.get_public_bookings, render,
+                                 "Unable to load open meetings")
     
     def _show_past_bookings_content(self, parent):
         """Show past bookings content"""
-        try:
-            bookings = self.app.api_client.get_past_bookings()
-            
+        def render(bookings):
             if not bookings:
                 ttk.Label(parent, text="No past bookings", 
                          font=('Arial', 14)).pack(expand=True, pady=50)
@@ -258,9 +366,9 @@ class Dashboard:
             
             # Display all bookings in a single table
             self._display_bookings_table(parent, bookings, action_type='past')
-
-        except Exception as e:
-            self._show_error_in_frame(parent, "Unable to load past bookings")
+        
+        self._load_in_background(parent, self.app.api_client.get_past_bookings, render,
+                                 "Unable to load past bookings")
     
     def _display_bookings_table(self, parent, bookings, action_type='none'):
         """
@@ -289,19 +397,14 @@ class Dashboard:
             tree.heading(col, text=col)
             tree.column(col, width=column_widths[col])
         
-        # Store bookings data for later reference
-        self.current_bookings = {str(b.get('id')): b for b in bookings}
+        # Store bookings data for later reference (tabs of one view load side by side)
+        self.current_bookings.update({str(b.get('id')): b for b in bookings})
         
-        # Add data
-        for booking in bookings:
-            tree.insert('', tk.END, values=(
-                booking.get('title', ''),
-                booking.get('room_name', ''),
-                booking.get('date', ''),
-                f"{booking.get('start_time', '')} - {booking.get('end_time', '')}",
-                f"{booking.get('current_attendees', 0)}/{booking.get('capacity', 0)}",
-                booking.get('status', 'Confirmed')
-            ), tags=(str(booking.get('id')),))
+        # Add data: format every row first, then insert in a tight loop
+        rows = [(_booking_row(booking), (str(booking.get('id')),)) for booking in bookings]
+        insert = tree.insert
+        for values, tags in rows:
+            insert('', tk.END, values=values, tags=tags)
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
@@ -375,17 +478,32 @@ class Dashboard:
             booking_id = tree.item(selection[0], "tags")[0]
             self.show_booking_details(booking_id)
     
-    def _show_reason_dialog(self, title, prompt):
-        """Show a dialog to get a cancellation/decline reason"""
+    def _open_dialog(self, title):
+        """
+        Create a dialog window titled title, or return None after raising the
+        one already open: a second copy could send the same request twice.
+        """
+        existing = self._dialogs.get(title)
+        if existing is not None and existing.winfo_exists():
+            existing.lift()
+            existing.focus_force()
+            return None
         dialog = tk.Toplevel(self.app.root)
         dialog.title(title)
-        dialog.geometry("400x250")
-        dialog.grab_set()
-        
         # Center the dialog
         dialog.transient(self.app.root)
-        
-        result = {"reason": None, "confirmed": False}
+        self._dialogs[title] = dialog
+        return dialog
+    
+    def _show_reason_dialog(self, title, prompt, on_confirm):
+        """
+        Show a dialog to get a cancellation/decline reason. Returns at once;
+        on_confirm(reason) runs if the user confirms, reason being None if blank.
+        """
+        dialog = self._open_dialog(title)
+        if dialog is None:
+            return
+        dialog.geometry("400x250")
         
         # Main frame
         main_frame = ttk.Frame(dialog, padding="20")
@@ -408,110 +526,51 @@ class Dashboard:
         button_frame.pack(pady=(10, 0))
         
         def confirm():
-            result["reason"] = reason_text.get("1.0", tk.END).strip() or None
-            result["confirmed"] = True
-            dialog.destroy()
-        
-        def cancel():
-            result["confirmed"] = False
+            reason = reason_text.get("1.0", tk.END).strip() or None
             dialog.destroy()
+            on_confirm(reason)
         
         ttk.Button(button_frame, text="Confirm", 
                   command=confirm).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", 
-                  command=cancel).pack(side=tk.LEFT, padx=5)
+                  command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def _confirm(self, title, message, on_yes):
+        """Ask a yes/no question without blocking; on_yes() runs if the user says Yes"""
+        dialog = self._open_dialog(title)
+        if dialog is None:
+            return
+        dialog.resizable(False, False)
+        
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text=message, 
+                 font=('Arial', 11), wraplength=350).pack(pady=(0, 15))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack()
+        
+        def yes():
+            dialog.destroy()
+            on_yes()
         
-        # Wait for dialog to close
-        dialog.wait_window()
-        return result
+        ttk.Button(button_frame, text="Yes", command=yes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="No", 
+                  command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+    
+    def _toast(self, message):
+        """Show a short message at the top of the content area for TOAST_MS"""
+        toast = tk.Label(self.content_frame, text=message, bg=COLORS['success'], 
+                        fg='white', font=('Arial', 10, 'bold'), padx=10, pady=5)
+        toast.place(relx=0.5, y=10, anchor=tk.N)
+        # The next view change may already have destroyed it
+        self.app.root.after(TOAST_MS, lambda: toast.winfo_exists() and toast.destroy())
     
     def show_booking_details(self, booking_id):
         """Show detailed booking information with management options"""
-        try:
-            # Fetch full booking details from API
-            booking = self.app.api_client.get_booking(int(booking_id))
-            
-            # Create a new window for booking details
-            details_window = tk.Toplevel(self.app.root)
-            details_window.title(f"Booking Details - {booking.get('title', 'N/A')}")
-            details_window.geometry("600x500")
-            details_window.grab_set()  # Modal window
-            
-            # Main frame
-            main_frame = ttk.Frame(details_window, padding="20")
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Title
-            ttk.Label(main_frame, text=booking.get('title', 'N/A'), 
-                     font=('Arial', 16, 'bold')).pack(pady=(0, 20))
-            
-            # Details frame with grid layout
-            details_frame = ttk.Frame(main_frame)
-            details_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
-            
-            # Booking information
-            info = [
-                ("Room:", booking.get('room_name', 'N/A')),
-                ("Date:", booking.get('date', 'N/A')),
-                ("Start Time:", booking.get('start_time', 'N/A')),
-                ("End Time:", booking.get('end_time', 'N/A')),
-                ("Attendees:", f"{booking.get('current_attendees', 0)}/{booking.get('capacity', 0)}"),
-                ("Status:", booking.get('status', 'Confirmed')),
-            ]
-            
-            for i, (label, value) in enumerate(info):
-                ttk.Label(details_frame, text=label, 
-                         font=('Arial', 10, 'bold')).grid(row=i, column=0, sticky=tk.W, pady=5, padx=(0, 10))
-                ttk.Label(details_frame, text=value, 
-                         font=('Arial', 10)).grid(row=i, column=1, sticky=tk.W, pady=5)
-            
-            # Attendee emails section
-            attendee_emails = booking.get('attendee_emails', [])
-            if attendee_emails:
-                row_offset = len(info)
-                ttk.Label(details_frame, text="Invited:", 
-                         font=('Arial', 10, 'bold')).grid(row=row_offset, column=0, sticky=tk.NW, pady=5, padx=(0, 10))
-                
-                # Display emails as comma-separated list with wrapping
-                emails_text = ", ".join(attendee_emails)
-                emails_label = ttk.Label(details_frame, text=emails_text, 
-                                        font=('Arial', 10), wraplength=350)
-                emails_label.grid(row=row_offset, column=1, sticky=tk.W, pady=5)
-            
-            # Notes section
-            if booking.get('notes'):
-                ttk.Label(main_frame, text="Notes:", 
-                         font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 5))
-                
-                notes_frame = ttk.Frame(main_frame, relief='solid', borderwidth=1)
-                notes_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
-                
-                notes_text = tk.Text(notes_frame, height=5, wrap=tk.WORD, 
-                                    font=('Arial', 10), state='disabled')
-                notes_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-                notes_text.config(state='normal')
-                notes_text.insert('1.0', booking.get('notes', ''))
-                notes_text.config(state='disabled')
-            
-            # Action buttons (only if organizer)
-            if booking.get('is_organizer'):
-                button_frame = ttk.Frame(main_frame)
-                button_frame.pack(fill=tk.X, pady=(10, 0))
-                
-                ttk.Button(button_frame, text="Edit Booking", 
-                          command=lambda: [details_window.destroy(), self.edit_booking(booking)]).pack(side=tk.LEFT, padx=5)
-                
-                ttk.Button(button_frame, text="Cancel Booking", 
-                          command=lambda: [details_window.destroy(), self.cancel_booking(booking)],
-).pack(side=tk.LEFT, padx=5)
-                
-                ttk.Button(button_frame, text="Close", 
-                          command=details_window.destroy).pack(side=tk.RIGHT, padx=5)
-            else:
-                ttk.Button(main_frame, text="Close", 
-                          command=details_window.destroy).pack(pady=(10, 0))
-            
-        except Exception as e:
+        def show_error(e):
             error_msg = str(e)
             if "not found" in error_msg.lower() or "404" in error_msg:
                 messagebox.showinfo("Booking Not Found", 
@@ -519,6 +578,92 @@ class Dashboard:
                     "It may have been cancelled by the organiser.")
             else:
                 messagebox.showerror("Error", f"Unable to load booking details: {error_msg}")
+        
+        # Fetch full booking details from API
+        self._run_in_background(lambda: self.app.api_client.get_booking(int(booking_id)),
+                                self._open_booking_details_window, show_error)
+    
+    def _open_booking_details_window(self, booking):
+        """Open the booking details window for a booking fetched from the API"""
+        # Create a new window for booking details
+        details_window = tk.Toplevel(self.app.root)
+        details_window.title(f"Booking Details - {booking.get('title', 'N/A')}")
+        details_window.geometry("600x500")
+        details_window.grab_set()  # Modal window
+        
+        # Main frame
+        main_frame = ttk.Frame(details_window, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        ttk.Label(main_frame, text=booking.get('title', 'N/A'), 
+                 font=('Arial', 16, 'bold')).pack(pady=(0, 20))
+        
+        # Details frame with grid layout
+        details_frame = ttk.Frame(main_frame)
+        details_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+        
+        # Booking information
+        info = [
+            ("Room:", booking.get('room_name', 'N/A')),
+            ("Date:", booking.get('date', 'N/A')),
+            ("Start Time:", booking.get('start_time', 'N/A')),
+            ("End Time:", booking.get('end_time', 'N/A')),
+            ("Attendees:", f"{booking.get('current_attendees', 0)}/{booking.get('capacity', 0)}"),
+            ("Status:", booking.get('status', 'Confirmed')),
+        ]
+        
+        for i, (label, value) in enumerate(info):
+            ttk.Label(details_frame, text=label, 
+                     font=('Arial', 10, 'bold')).grid(row=i, column=0, sticky=tk.W, pady=5, padx=(0, 10))
+            ttk.Label(details_frame, text=value, 
+                     font=('Arial', 10)).grid(row=i, column=1, sticky=tk.W, pady=5)
+        
+        # Attendee emails section
+        attendee_emails = booking.get('attendee_emails', [])
+        if attendee_emails:
+            row_offset = len(info)
+            ttk.Label(details_frame, text="Invited:", 
+                     font=('Arial', 10, 'bold')).grid(row=row_offset, column=0, sticky=tk.NW, pady=5, padx=(0, 10))
+            
+            # Display emails as comma-separated list with wrapping
+            emails_text = ", ".join(attendee_emails)
+            emails_label = ttk.Label(details_frame, text=emails_text, 
+                                    font=('Arial', 10), wraplength=350)
+            emails_label.grid(row=row_offset, column=1, sticky=tk.W, pady=5)
+        
+        # Notes section
+        if booking.get('notes'):
+            ttk.Label(main_frame, text="Notes:", 
+                     font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 5))
+            
+            notes_frame = ttk.Frame(main_frame, relief='solid', borderwidth=1)
+            notes_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+            
+            notes_text = tk.Text(notes_frame, height=5, wrap=tk.WORD, 
+                                font=('Arial', 10), state='disabled')
+            notes_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            notes_text.config(state='normal')
+            notes_text.insert('1.0', booking.get('notes', ''))
+            notes_text.config(state='disabled')
+        
+        # Action buttons (only if organizer)
+        if booking.get('is_organizer'):
+            button_frame = ttk.Frame(main_frame)
+            button_frame.pack(fill=tk.X, pady=(10, 0))
+            
+            ttk.Button(button_frame, text="Edit Booking", 
+                      command=lambda: [details_window.destroy(), self.edit_booking(booking)]).pack(side=tk.LEFT, padx=5)
+            
+            ttk.Button(button_frame, text="Cancel Booking", 
+                      command=lambda: [details_window.destroy(), self.cancel_booking(booking)],
+).pack(side=tk.LEFT, padx=5)
+            
+            ttk.Button(button_frame, text="Close", 
+                      command=details_window.destroy).pack(side=tk.RIGHT, padx=5)
+        else:
+            ttk.Button(main_frame, text="Close", 
+                      command=details_window.destroy).pack(pady=(10, 0))
     
     def _view_attendee_booking(self, tree):
         """View details of a booking as attendee"""
@@ -529,10 +674,7 @@ class Dashboard:
         
         booking_id = tree.item(selection[0], "tags")[0]
         
-        try:
-            # Fetch full booking details from API
-            booking = self.app.api_client.get_booking(int(booking_id))
-            
+        def show_info(booking):
             # Create info message with booking details
             info = f"""
 Booking Details
@@ -547,9 +689,12 @@ Status: {booking.get('status', 'Confirmed')}
 Notes: {booking.get('notes', 'None')}
 """
             messagebox.showinfo("Booking Details", info.strip())
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to load booking details: {str(e)}")
+        
+        # Fetch full booking details from API
+        self._run_in_background(
+            lambda: self.app.api_client.get_booking(int(booking_id)), show_info,
+            lambda e: messagebox.showerror("Error", f"Unable to load booking details: {str(e)}")
+        )
     
     def _decline_booking(self, tree):
         """Decline/leave a booking as attendee with optional reason"""
@@ -564,33 +709,31 @@ Notes: {booking.get('notes', 'None')}
         booking = self.current_bookings.get(booking_id, {})
         booking_title = booking.get('title', 'this booking')
         
-        # Show reason dialog
-        result = self._show_reason_dialog(
-            "Decline/Leave Booking",
-            f"Are you sure you want to leave '{booking_title}'?\n\n"
-            "You will no longer be registered for this meeting.\n\n"
-            "You can optionally provide a reason:"
-        )
-        
-        if not result["confirmed"]:
-            return
-        
-        try:
-            # Call API to decline invitation with optional reason
-            response = self.app.api_client.decline_invitation(int(booking_id), result["reason"])
-            
+        def on_declined(response):
             if response:
-                messagebox.showinfo("Success", 
-                                  f"You have successfully left '{booking_title}'")
                 # Update notification badge
                 self.update_notification_badge()
                 # Refresh the bookings view
                 self.show_dashboard_view()
+                self._toast(f"You have left '{booking_title}'")
             else:
                 messagebox.showerror("Error", "Failed to leave booking")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to leave booking: {str(e)}")
+        
+        def decline(reason):
+            # Call API to decline invitation with optional reason
+            self._run_in_background(
+                lambda: self.app.api_client.decline_invitation(int(booking_id), reason), on_declined,
+                lambda e: messagebox.showerror("Error", f"Unable to leave booking: {str(e)}")
+            )
+        
+        # Show reason dialog
+        self._show_reason_dialog(
+            "Decline/Leave Booking",
+            f"Are you sure you want to leave '{booking_title}'?\n\n"
+            "You will no longer be registered for this meeting.\n\n"
+            "You can optionally provide a reason:",
+            decline
+        )
     
     def _accept_invitation(self, tree):
         """Accept a pending invitation"""
@@ -605,22 +748,21 @@ Notes: {booking.get('notes', 'None')}
         booking = self.current_bookings.get(booking_id, {})
         booking_title = booking.get('title', 'this booking')
         
-        try:
-            # Call API to accept invitation
-            response = self.app.api_client.accept_invitation(int(booking_id))
-            
+        def on_accepted(response):
             if response:
-                messagebox.showinfo("Success", 
-                                  f"You have accepted the invitation to '{booking_title}'")
                 # Update notification badge
                 self.update_notification_badge()
                 # Refresh the bookings view
                 self.show_dashboard_view()
+                self._toast(f"You have accepted the invitation to '{booking_title}'")
             else:
                 messagebox.showerror("Error", "Failed to accept invitation")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to accept invitation: {str(e)}")
+        
+        # Call API to accept invitation
+        self._run_in_background(
+            lambda: self.app.api_client.accept_invitation(int(booking_id)), on_accepted,
+            lambda e: messagebox.showerror("Error", f"Unable to accept invitation: {str(e)}")
+        )
     
     def _register_for_public(self, tree):
         """Register for a public meeting"""
@@ -633,15 +775,17 @@ Notes: {booking.get('notes', 'None')}
         booking = self.current_bookings.get(booking_id, {})
         title = booking.get('title', 'this meeting')
         
-        if not messagebox.askyesno("Confirm Registration", f"Join '{title}'?"):
-            return
-        
-        try:
-            self.app.api_client.register_for_booking(int(booking_id))
-            messagebox.showinfo("Registered", f"You are now registered for '{title}'")
+        def on_registered(_):
             self.show_open_meetings()
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to register: {str(e)}")
+            self._toast(f"You are now registered for '{title}'")
+        
+        self._confirm(
+            "Confirm Registration", f"Join '{title}'?",
+            lambda: self._run_in_background(
+                lambda: self.app.api_client.register_for_booking(int(booking_id)), on_registered,
+                lambda e: messagebox.showerror("Error", f"Unable to register: {str(e)}")
+            )
+        )
     
     def show_notifications(self):
         """Show notifications view"""
@@ -658,14 +802,12 @@ Notes: {booking.get('notes', 'None')}
                  font=('Arial', 16, 'bold')).pack(side=tk.LEFT)
         
         ttk.Button(header_frame, text="Refresh", 
-                  command=self.show_notifications).pack(side=tk.RIGHT, padx=5)
+                  command=self._refresh_notifications).pack(side=tk.RIGHT, padx=5)
         
         ttk.Button(header_frame, text="Mark All as Read", 
                   command=self._mark_all_notifications_read).pack(side=tk.RIGHT, padx=5)
         
-        try:
-            notifications = self.app.api_client.get_notifications()
-            
+        def render(notifications):
             if not notifications:
                 no_notif_frame = ttk.Frame(main_frame)
                 no_notif_frame.pack(expand=True)
@@ -697,9 +839,9 @@ Notes: {booking.get('notes', 'None')}
             
             # Update badge after showing notifications
             self.update_notification_badge()
-            
-        except Exception as e:
-            self._show_error_in_frame(main_frame, "Unable to load notifications")
+        
+        self._load_in_background(main_frame, self.app.api_client.get_notifications, render,
+                                 "Unable to load notifications")
     
     def _create_notification_card(self, parent, notification):
         """Create a notification card"""
@@ -757,34 +899,46 @@ Notes: {booking.get('notes', 'None')}
                   command=lambda n_id=notification['id']: self._delete_notification(n_id),
 ).pack(side=tk.RIGHT, padx=2)
     
+    def _refresh_notifications(self):
+        """Reload notifications from the server, skipping cached responses"""
+        self.app.api_client.invalidate("/notifications")
+        self.show_notifications()
+    
     def _mark_notification_read(self, notification_id):
         """Mark a single notification as read"""
-        try:
-            self.app.api_client.mark_notification_read(notification_id)
-            self.show_notifications()  # Refresh view
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to mark notification as read: {str(e)}")
+        self._run_in_background(
+            lambda: self.app.api_client.mark_notification_read(notification_id),
+            lambda _: self.show_notifications(),  # Refresh view
+            lambda e: messagebox.showerror("Error", f"Unable to mark notification as read: {str(e)}")
+        )
     
     def _mark_all_notifications_read(self):
         """Mark all notifications as read"""
-        try:
-            notifications = self.app.api_client.get_notifications()
-            for notif in notifications:
+        def mark_all():
+            # One worker call for the whole loop, so the UI stays responsive throughout
+            for notif in self.app.api_client.get_notifications():
                 if not notif['is_read']:
                     self.app.api_client.mark_notification_read(notif['id'])
+        
+        def on_marked(_):
             self.show_notifications()  # Refresh view
-            messagebox.showinfo("Success", "All notifications marked as read")
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to mark notifications as read: {str(e)}")
+            self._toast("All notifications marked as read")
+        
+        self._run_in_background(
+            mark_all, on_marked,
+            lambda e: messagebox.showerror("Error", f"Unable to mark notifications as read: {str(e)}")
+        )
     
     def _delete_notification(self, notification_id):
         """Delete a notification"""
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this notification?"):
-            try:
-                self.app.api_client.delete_notification(notification_id)
-                self.show_notifications()  # Refresh view
-            except Exception as e:
-                messagebox.showerror("Error", f"Unable to delete notification: {str(e)}")
+        self._confirm(
+            "Confirm Delete", "Are you sure you want to delete this notification?",
+            lambda: self._run_in_background(
+                lambda: self.app.api_client.delete_notification(notification_id),
+                lambda _: self.show_notifications(),  # Refresh view
+                lambda e: messagebox.showerror("Error", f"Unable to delete notification: {str(e)}")
+            )
+        )
     
     def show_create_booking(self, preselected_room=None):
         """Show booking creation form with optional pre-selected room"""
@@ -892,7 +1046,7 @@ Notes: {booking.get('notes', 'None')}
         check_btn = ModernButton(
             form_frame,
             text="Check Available Rooms",
-            command=self.check_availability,
+            command=lambda: self._debounce(DEBOUNCE_MS, self.check_availability),
             style='primary',
             width=25
         )
@@ -944,27 +1098,27 @@ Notes: {booking.get('notes', 'None')}
         if not self._validate_booking_fields(title, date, selected_room):
             return
         
-        try:
-            booking_data = {
-                "title": title,
-                "date": date,
-                "start_time": start_time,
-                "end_time": end_time,
-                "room_id": selected_room["id"],
-                "attendee_emails": attendee_emails,
-                "notes": notes
-            }
-            
-            response = self.app.api_client.create_booking(booking_data)
-            
+        booking_data = {
+            "title": title,
+            "date": date,
+            "start_time": start_time,
+            "end_time": end_time,
+            "room_id": selected_room["id"],
+            "attendee_emails": attendee_emails,
+            "notes": notes
+        }
+        
+        def on_created(response):
             if response:
-                messagebox.showinfo("Success", "Booking created successfully!")
                 self.show_dashboard_view()
+                self._toast("Booking created successfully!")
             else:
                 messagebox.showerror("Error", "Failed to create booking")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to create booking: {str(e)}")
+        
+        self._run_in_background(
+            lambda: self.app.api_client.create_booking(booking_data), on_created,
+            lambda e: messagebox.showerror("Error", f"Unable to create booking: {str(e)}")
+        )
     
     def show_manage_bookings(self):
         """Show manage bookings view with organized and invited tabs"""
@@ -989,9 +1143,7 @@ Notes: {booking.get('notes', 'None')}
     
     def _show_organized_meetings_content(self, parent):
         """Show organized meetings content with management options"""
-        try:
-            bookings = self.app.api_client.get_organized_bookings()
-            
+        def render(bookings):
             if not bookings:
                 ttk.Label(parent, text="You haven't organized any bookings", 
                          font=('Arial', 12)).pack(expand=True, pady=50)
@@ -1018,16 +1170,13 @@ Notes: {booking.get('notes', 'None')}
             # Create booking cards
             for booking in bookings:
                 self._create_booking_card(scrollable_frame, booking)
-                
-        except Exception as e:
-            self._show_error_in_frame(parent, "Unable to load organized bookings")
+        
+        self._load_in_background(parent, self.app.api_client.get_organized_bookings, render,
+                                 "Unable to load organized bookings")
     
     def _show_invited_meetings_content(self, parent):
         """Show invited meetings content (pending and accepted)"""
-        try:
-            # Get all upcoming bookings and filter for invited ones
-            all_bookings = self.app.api_client.get_upcoming_bookings()
-            
+        def render(all_bookings):
             # Filter for bookings where user is invited (not organizer)
             invited_bookings = [b for b in all_bookings if not b.get('is_organizer')]
             
@@ -1053,9 +1202,10 @@ Notes: {booking.get('notes', 'None')}
             accepted_frame = ttk.Frame(sub_notebook)
             sub_notebook.add(accepted_frame, text="Accepted")
             self._display_bookings_table(accepted_frame, accepted, action_type='accepted')
-            
-        except Exception as e:
-            self._show_error_in_frame(parent, "Unable to load invited meetings")
+        
+        # Get all upcoming bookings and filter for invited ones
+        self._load_in_background(parent, self.app.api_client.get_upcoming_bookings, render,
+                                 "Unable to load invited meetings")
     
     def _create_booking_card(self, parent, booking):
         """Create a booking card with management options"""
@@ -1161,7 +1311,7 @@ Notes: {booking.get('notes', 'None')}
         check_btn = ModernButton(
             form_frame,
             text="Check Available Rooms",
-            command=self.check_availability_for_edit,
+            command=lambda: self._debounce(DEBOUNCE_MS, self.check_availability_for_edit),
             style='primary',
             width=25
         )
@@ -1209,27 +1359,28 @@ Notes: {booking.get('notes', 'None')}
         """Cancel a booking with optional reason"""
         if not self._require_organiser("Cancelling bookings"):
             return
-        # Show reason dialog
-        result = self._show_reason_dialog(
-            "Cancel Booking",
-            f"Are you sure you want to cancel '{booking['title']}'?\n\n"
-            "All attendees will be notified.\n\n"
-            "You can optionally provide a reason:"
-        )
-        
-        if not result["confirmed"]:
-            return
-        
-        try:
-            success = self.app.api_client.cancel_booking(booking['id'], result["reason"])
+        def on_cancelled(success):
             if success:
-                messagebox.showinfo("Success", "Booking cancelled successfully")
                 self.update_notification_badge()
                 self.show_manage_bookings()
+                self._toast("Booking cancelled successfully")
             else:
                 messagebox.showerror("Error", "Failed to cancel booking")
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to cancel booking: {str(e)}")
+        
+        def cancel(reason):
+            self._run_in_background(
+                lambda: self.app.api_client.cancel_booking(booking['id'], reason), on_cancelled,
+                lambda e: messagebox.showerror("Error", f"Unable to cancel booking: {str(e)}")
+            )
+        
+        # Show reason dialog
+        self._show_reason_dialog(
+            "Cancel Booking",
+            f"Are you sure you want to cancel '{booking['title']}'?\n\n"
+            "All attendees will be notified.\n\n"
+            "You can optionally provide a reason:",
+            cancel
+        )
     
     def check_availability_for_edit(self):
         """Check room availability for editing (similar to check_availability but for edit form)"""
@@ -1243,15 +1394,17 @@ Notes: {booking.get('notes', 'None')}
         if not self._validate_datetime_inputs(date, start_time, end_time):
             return
 
-        rooms = self._load_available_rooms(date, start_time, end_time, self.edit_room_listbox, "edit_room_data")
+        def select_current_room(rooms):
+            # Pre-select current room if it's available
+            if rooms:
+                for i, room in enumerate(rooms):
+                    if room['id'] == self.current_room_id:
+                        self.edit_room_listbox.selection_set(i)
+                        self.edit_room_listbox.see(i)
+                        break
 
-        # Pre-select current room if it's available
-        if rooms:
-            for i, room in enumerate(rooms):
-                if room['id'] == self.current_room_id:
-                    self.edit_room_listbox.selection_set(i)
-                    self.edit_room_listbox.see(i)
-                    break
+        self._load_available_rooms(date, start_time, end_time, self.edit_room_listbox, "edit_room_data",
+                                   on_loaded=select_current_room)
     
     def get_selected_room_for_edit(self):
         """Get selected room data from edit form"""
@@ -1283,28 +1436,29 @@ Notes: {booking.get('notes', 'None')}
         if not self._validate_booking_fields(title, date, selected_room):
             return
         
-        try:
-            # Prepare update data with all attendees (existing + new)
-            booking_data = {
-                "title": title,
-                "date": date,
-                "start_time": start_time,
-                "end_time": end_time,
-                "room_id": selected_room["id"],
-                "attendee_emails": all_attendee_emails,  # All attendees (existing + new)
-                "notes": notes,
-            }
-            
-            response = self.app.api_client.update_booking(self.editing_booking_id, booking_data)
-            
+        # Prepare update data with all attendees (existing + new)
+        booking_data = {
+            "title": title,
+            "date": date,
+            "start_time": start_time,
+            "end_time": end_time,
+            "room_id": selected_room["id"],
+            "attendee_emails": all_attendee_emails,  # All attendees (existing + new)
+            "notes": notes,
+        }
+        booking_id = self.editing_booking_id
+        
+        def on_updated(response):
             if response:
-                messagebox.showinfo("Success", "Booking updated successfully!")
                 self.show_manage_bookings()
+                self._toast("Booking updated successfully!")
             else:
                 messagebox.showerror("Error", "Failed to update booking")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to update booking: {str(e)}")
+        
+        self._run_in_background(
+            lambda: self.app.api_client.update_booking(booking_id, booking_data), on_updated,
+            lambda e: messagebox.showerror("Error", f"Unable to update booking: {str(e)}")
+        )
     
     def show_room_browser(self):
         """Show room browser"""
@@ -1349,9 +1503,13 @@ Notes: {booking.get('notes', 'None')}
                                         state="readonly", width=15)
         accessibility_combo.grid(row=0, column=5, padx=(0, 20))
         
+        # Re-filter as soon as a filter changes; rapid changes collapse into one redraw
+        for combo in (capacity_combo, facilities_combo, accessibility_combo):
+            combo.bind("<<ComboboxSelected>>", lambda e: self._debounce(DEBOUNCE_MS, self.apply_room_filters))
+        
         # Apply filters button
         ttk.Button(filter_frame, text="Apply Filters", 
-                  command=self.load_rooms).grid(row=0, column=6)
+                  command=self.apply_room_filters).grid(row=0, column=6)
         
         # Create scrollable canvas for rooms
         canvas_container = ttk.Frame(main_frame)
@@ -1380,43 +1538,56 @@ Notes: {booking.get('notes', 'None')}
         self.load_rooms()
     
     def load_rooms(self):
-        """Load and display rooms based on filters"""
+        """Fetch the rooms visible to this user and display them based on filters"""
         # Clear existing rooms
         for widget in self.rooms_frame.winfo_children():
             widget.destroy()
+        self.all_rooms = None
         
         # Show loading state
         loading_label = ttk.Label(self.rooms_frame, text="Loading rooms...", font=('Arial', 12))
         loading_label.pack(pady=50)
-        self.rooms_frame.update()
+        rooms_frame = self.rooms_frame
         
-        try:
-            rooms = self.app.api_client.get_all_rooms()
-            
+        def show_rooms(rooms):
             # Remove loading label
             loading_label.destroy()
-            
-            if not rooms:
-                ttk.Label(self.rooms_frame, text="No rooms available", font=('Arial', 12)).pack(pady=50)
-                return
-            
-            # Apply filters
-            filtered_rooms = self._apply_filters(rooms)
-            
-            if not filtered_rooms:
-                ttk.Label(self.rooms_frame, text="No rooms match your criteria", font=('Arial', 12)).pack(pady=50)
-                return
-            
-            # Create room cards
-            for i, room in enumerate(filtered_rooms):
-                self._create_room_card(room, i)
-                
-        except Exception as e:
-            # Show error
-            for widget in self.rooms_frame.winfo_children():
+            self.all_rooms = rooms or []
+            self._show_room_cards()
+        
+        def show_error(e):
+            for widget in rooms_frame.winfo_children():
                 widget.destroy()
-            ttk.Label(self.rooms_frame, text=f"Unable to load rooms: {str(e)}", 
+            ttk.Label(rooms_frame, text=f"Unable to load rooms: {str(e)}", 
                      font=('Arial', 11), foreground='red', wraplength=500).pack(pady=50)
+        
+        self._run_in_background(self.app.api_client.get_all_rooms, show_rooms, show_error, owner=rooms_frame)
+    
+    def apply_room_filters(self):
+        """Re-filter the rooms already fetched for this view (fetching them if still missing)"""
+        if self.all_rooms is None:
+            self.load_rooms()
+            return
+        for widget in self.rooms_frame.winfo_children():
+            widget.destroy()
+        self._show_room_cards()
+    
+    def _show_room_cards(self):
+        """Create cards for the fetched rooms that match the current filters"""
+        if not self.all_rooms:
+            ttk.Label(self.rooms_frame, text="No rooms available", font=('Arial', 12)).pack(pady=50)
+            return
+        
+        # Apply filters
+        filtered_rooms = self._apply_filters(self.all_rooms)
+        
+        if not filtered_rooms:
+            ttk.Label(self.rooms_frame, text="No rooms match your criteria", font=('Arial', 12)).pack(pady=50)
+            return
+        
+        # Create room cards
+        for i, room in enumerate(filtered_rooms):
+            self._create_room_card(room, i)
     
     def _apply_filters(self, rooms):
         """Apply filters to room list"""
@@ -1496,28 +1667,34 @@ Notes: {booking.get('notes', 'None')}
         # Update notification badge
         self.update_notification_badge()
         
-        try:
-            profile = self.app.api_client.get_user_profile() or self.app.current_user
-            
-            profile_frame = ttk.Frame(self.content_frame)
-            profile_frame.pack(expand=True, pady=50)
-            
-            ttk.Label(profile_frame, text="User Profile", 
-                     font=('Arial', 16, 'bold')).pack(pady=20)
-            
-            # Profile info
-            info_frame = ttk.Frame(profile_frame)
-            info_frame.pack(pady=20)
-            
+        profile_frame = ttk.Frame(self.content_frame)
+        profile_frame.pack(expand=True, pady=50)
+        
+        ttk.Label(profile_frame, text="User Profile", 
+                 font=('Arial', 16, 'bold')).pack(pady=20)
+        
+        # Profile info
+        info_frame = ttk.Frame(profile_frame)
+        info_frame.pack(pady=20)
+        loading_label = ttk.Label(info_frame, text="Loading...", font=('Arial', 12))
+        loading_label.pack(pady=5)
+        
+        def show_profile_info(profile):
+            profile = profile or self.app.current_user
+            loading_label.destroy()
             ttk.Label(info_frame, text=f"Name: {profile.get('name', 'N/A')}", 
                      font=('Arial', 12)).pack(anchor=tk.W, pady=5)
             ttk.Label(info_frame, text=f"Email: {profile.get('email', 'N/A')}", 
                      font=('Arial', 12)).pack(anchor=tk.W, pady=5)
             ttk.Label(info_frame, text=f"Role: {profile.get('role', 'User')}", 
                      font=('Arial', 12)).pack(anchor=tk.W, pady=5)
-            
-        except Exception as e:
+        
+        def show_error(e):
+            profile_frame.destroy()
             self._show_error("Unable to load profile")
+        
+        self._run_in_background(self.app.api_client.get_user_profile, show_profile_info, show_error,
+                                owner=profile_frame)
 
     def _show_error(self, message):
         """Show error message"""
@@ -0,0 +1,107 @@
+"""
+Tests for the API client's GET response cache and per-thread sessions.
+
+The client never reaches a server here: _send is replaced per test with a
+function that records the call and returns canned data.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Ensure the front end modules are importable when running tests from varied working dirs
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from api_client import APIClient
+
+
+def fake_send(client, responses, during=None):
+    """Replace client._send; each call pops the next response, after running during()"""
+    calls = []
+
+    def send(method, endpoint, data, params):
+        calls.append((method, endpoint))
+        if during:
+            during()
+        return responses.pop(0)
+
+    client._send = send
+    return calls
+
+
+def test_get_is_served_from_cache():
+    """Test a repeated GET does not go back to the server"""
+    client = APIClient()
+    calls = fake_send(client, [{"name": "Alice"}])
+    assert client.get_user_profile() == {"name": "Alice"}
+    assert client.get_user_profile() == {"name": "Alice"}
+    assert len(calls) == 1
+
+
+def test_mutating_a_response_leaves_the_cache_intact():
+    """Test sorting or filtering a returned list in place doesn't change the next result"""
+    client = APIClient()
+    fake_send(client, [[{"id": 2}, {"id": 1}]])
+    first = client.get_all_rooms()
+    first.sort(key=lambda room: room["id"])
+    second = client.get_all_rooms()
+    second.pop()
+
+    assert client.get_all_rooms() == [{"id": 2}, {"id": 1}]
+
+
+def test_get_in_flight_across_logout_is_not_cached():
+    """Test a profile fetch that finishes after logout is not served to the next user"""
+    client = APIClient()
+    client.set_token("alice-token")
+
+    def logout_and_login_as_bob():
+        client.set_token(None)
+        client.set_token("bob-token")
+
+    # Alice's prefetch is still waiting on the server when Bob logs in
+    fake_send(client, [{"name": "Alice"}], during=logout_and_login_as_bob)
+    assert client.get_user_profile() == {"name": "Alice"}
+
+    calls = fake_send(client, [{"name": "Bob"}])
+    assert client.get_user_profile() == {"name": "Bob"}
+    assert len(calls) == 1
+
+
+def test_get_in_flight_across_invalidate_is_not_cached():
+    """Test a GET overtaken by invalidate() is refetched next time"""
+    client = APIClient()
+    fake_send(client, [[{"id": 1, "is_read": False}]],
+              during=lambda: client.invalidate("/notifications"))
+    client.get_notifications()
+
+    calls = fake_send(client, [[{"id": 1, "is_read": True}]])
+    assert client.get_notifications() == [{"id": 1, "is_read": True}]
+    assert len(calls) == 1
+
+
+def test_get_in_flight_across_write_is_not_cached():
+    """Test a GET that started before a booking was created does not cache the old list"""
+    client = APIClient()
+
+    def create_booking_meanwhile():
+        client._send = lambda method, endpoint, data, params: {"id": 7}
+        client.create_booking({})
+
+    # The list GET sees no bookings, but the POST completes before it returns
+    fake_send(client, [[]], during=create_booking_meanwhile)
+    client.get_upcoming_bookings()
+
+    calls = fake_send(client, [[{"id": 7}]])
+    assert client.get_upcoming_bookings() == [{"id": 7}]
+    assert len(calls) == 1
+
+
+def test_each_thread_gets_its_own_session():
+    """Test worker threads never share a requests.Session"""
+    client = APIClient()
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.append(client.session))
+    worker.start()
+    worker.join()
+
+    assert client.session is client.session
+    assert sessions[0] is not client.session